@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Headless container entry point: run the crop pipeline behind the web API.
+
+Finds the input video in /workdir, analyzes it, and waits for a crop
+selection over the HTTP API before encoding. Configuration comes from
+environment variables (ASPECT_RATIO, ANALYSIS_FRAMES, GRID_SIZE, PRESET).
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from PIL import Image
+
+from smart_crop.analysis.ffmpeg import FFmpegAnalyzer
+from smart_crop.analysis.parallel import analyze_positions_parallel
+from smart_crop.candidates import (calculate_crop_dimensions, generate_analysis_grid,
+                                   generate_candidates, parse_aspect_ratio)
+from smart_crop.strategies import NormalizationBounds
+from smart_crop.web import AppState, create_app
+
+WORKDIR = Path(os.environ.get('WORKDIR', '/workdir'))
+PORT = int(os.environ.get('PORT', '8765'))
+
+
+def find_input_file() -> Path:
+    candidates = sorted(WORKDIR.glob('*.mov')) + sorted(WORKDIR.glob('*.mp4'))
+    if not candidates:
+        raise FileNotFoundError(f'no .mov/.mp4 input found in {WORKDIR}')
+    return candidates[0]
+
+
+def run_pipeline(state: AppState, preview_dir: Path, gen: int = 0,
+                 current_gen: Optional[Callable[[], int]] = None) -> None:
+    """Run one analysis/selection/encode cycle.
+
+    `gen` is the pipeline generation this thread belongs to; when a
+    reset bumps the live generation, the stale thread notices at its
+    next checkpoint and exits instead of racing the replacement over
+    the shared state and output file.
+    """
+    def alive() -> bool:
+        return current_gen is None or current_gen() == gen
+
+    try:
+        input_file = find_input_file()
+        base_name = input_file.stem
+        aspect_ratio = os.environ.get('ASPECT_RATIO', '9:16')
+        sample_frames = int(os.environ.get('ANALYSIS_FRAMES', '30'))
+        grid_size = int(os.environ.get('GRID_SIZE', '5'))
+        preset = os.environ.get('PRESET', 'medium')
+
+        analyzer = FFmpegAnalyzer(str(input_file))
+        info = analyzer.get_video_info()
+        aspect_w, aspect_h = parse_aspect_ratio(aspect_ratio)
+        crop = calculate_crop_dimensions(info['width'], info['height'],
+                                         aspect_w, aspect_h)
+
+        if not alive():
+            return
+        state.update(state='analyzing')
+        positions = generate_analysis_grid(info['width'], info['height'],
+                                           crop.width, crop.height,
+                                           grid_size=grid_size)
+        metrics = analyze_positions_parallel(
+            str(input_file), positions, crop.width, crop.height,
+            sample_frames=sample_frames,
+            progress_callback=lambda c, t: alive() and state.update(
+                progress=int(c / t * 100)))
+
+        bounds = NormalizationBounds.from_positions(metrics)
+        candidates = generate_candidates(metrics, bounds,
+                                         info['width'], info['height'])
+
+        temp_frame = preview_dir / f'.{base_name}_preview_frame.jpg'
+        analyzer.extract_frame(info['duration'] / 2, str(temp_frame))
+        frame = Image.open(temp_frame)
+        for i, c in enumerate(candidates, 1):
+            cropped = frame.crop((c.x, c.y, c.x + crop.width, c.y + crop.height))
+            cropped.save(preview_dir / f'{base_name}_crop_option_{i}.jpg',
+                         'JPEG', quality=85)
+        frame.close()
+        if temp_frame.exists():
+            temp_frame.unlink()
+
+        if not alive():
+            return
+        state.update(state='awaiting_selection',
+                     candidates=[{'x': c.x, 'y': c.y, 'score': c.score,
+                                  'strategy': c.strategy} for c in candidates])
+
+        while state.get('selected_index') is None:
+            if not alive():
+                return
+            time.sleep(0.5)
+        if not alive():
+            return
+        selected = candidates[state.get('selected_index') - 1]
+
+        state.update(state='encoding', progress=0)
+        output_file = WORKDIR / f'{base_name}_cropped.mp4'
+        import subprocess
+        result = subprocess.run(
+            ['ffmpeg', '-y', '-i', str(input_file),
+             '-vf', f'crop={crop.width}:{crop.height}:{selected.x}:{selected.y}',
+             '-c:v', 'libx264', '-preset', preset, '-crf', '20',
+             '-c:a', 'copy', str(output_file)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f'encode failed: {result.stderr[-500:]}')
+        if alive():
+            state.update(state='complete', progress=100)
+    except Exception as exc:  # surfaced through /api/status
+        if alive():
+            state.update(state='error', error=str(exc))
+
+
+def main() -> int:
+    state = AppState()
+    preview_dir = WORKDIR
+    reset_lock = threading.Lock()
+
+    def preview_path_for(index):
+        try:
+            base_name = find_input_file().stem
+        except FileNotFoundError:
+            return None
+        path = preview_dir / f'{base_name}_crop_option_{index}.jpg'
+        return str(path) if path.exists() else None
+
+    # Monotonic pipeline generation; stale threads compare against it.
+    pipeline_gen = [0]
+
+    def start_pipeline():
+        gen = pipeline_gen[0]
+        threading.Thread(
+            target=run_pipeline,
+            args=(state, preview_dir, gen, lambda: pipeline_gen[0]),
+            daemon=True).start()
+
+    def reset_pipeline():
+        # Re-run the pipeline on a warm process: tests reuse one
+        # container and call POST /api/reset between cases. Bumping the
+        # generation first invalidates the previous thread (parked
+        # selection waiters poll and exit within one tick), then the
+        # state reset clears its leftovers before the new run starts.
+        with reset_lock:
+            pipeline_gen[0] += 1
+            state.reset()
+            start_pipeline()
+
+    start_pipeline()
+    app = create_app(state, preview_path_for=preview_path_for,
+                     reset_hook=reset_pipeline)
+    app.run(host='0.0.0.0', port=PORT, debug=False, use_reloader=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
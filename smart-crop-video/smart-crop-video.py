@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""Interactively pick the best crop of a video, then encode it.
+
+Analyzes a grid of candidate crop windows, shows preview JPEGs (and a small
+web UI) so you can pick one, optionally speeds up boring scenes, then encodes
+the cropped result.
+"""
+
+import argparse
+import os
+import queue
+import selectors
+import subprocess
+import sys
+import threading
+import time as time_module
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from smart_crop.analysis import create_analyzer
+from smart_crop.analysis.parallel import ProgressTracker, analyze_positions_parallel
+from smart_crop.candidates import (calculate_crop_dimensions, generate_analysis_grid,
+                                   generate_candidates, parse_aspect_ratio)
+from smart_crop.scene_analysis import analyze_scene_metrics, extract_scene_thumbnails
+from smart_crop.scenes import (create_scenes_from_timestamps,
+                               create_time_based_segments, filter_short_scenes,
+                               merge_short_scenes, parse_scene_timestamps)
+from smart_crop.strategies import (NormalizationBounds, determine_primary_metric,
+                                   identify_boring_sections_arr)
+from smart_crop.web import AppState, start_web_ui
+
+SCENE_THRESHOLD = 0.3
+MIN_SCENE_DURATION = 1.0
+FALLBACK_SEGMENT_DURATION = 5.0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('input_file', help='video to crop')
+    parser.add_argument('--aspect-ratio', default='9:16',
+                        help="target aspect ratio as 'W:H' (default 9:16)")
+    parser.add_argument('--grid-size', type=int, default=5,
+                        help='analysis grid is grid-size x grid-size positions')
+    parser.add_argument('--sample-frames', type=int, default=50,
+                        help='frames sampled per position during analysis')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='analysis worker processes (default: cpu count)')
+    parser.add_argument('--port', type=int, default=8765,
+                        help='port for the selection web UI')
+    parser.add_argument('--max-wait', type=float, default=300.0,
+                        help='seconds to wait for an interactive selection')
+    return parser.parse_args()
+
+
+def save_preview(index, candidate, frame, crop_w, crop_h, base_name):
+    """Crop the shared preview frame for one candidate and save a JPEG."""
+    cropped = frame.crop((candidate.x, candidate.y,
+                          candidate.x + crop_w, candidate.y + crop_h))
+    out_path = f'{base_name}_crop_option_{index}.jpg'
+    cropped.save(out_path, 'JPEG', quality=85)
+    return out_path
+
+
+def generate_previews(analyzer, candidates, crop_w, crop_h, duration, base_name):
+    """Write one preview JPEG per candidate, cropped from a mid-video frame."""
+    temp_frame = f'.{base_name}_preview_frame.jpg'
+    analyzer.extract_frame(duration / 2, temp_frame)
+    frame = Image.open(temp_frame)
+    # Decode eagerly before fanning out: Image.open is lazy and the first
+    # crop() would otherwise trigger the load inside a worker, racing the
+    # other threads over the shared image.
+    frame.load()
+    # Pillow releases the GIL during JPEG encode, so the per-candidate saves
+    # fan out nicely over threads instead of serializing on disk writes.
+    with ThreadPoolExecutor(max_workers=min(10, os.cpu_count() or 4)) as executor:
+        paths = list(executor.map(
+            lambda item: save_preview(item[0], item[1], frame, crop_w, crop_h,
+                                      base_name),
+            enumerate(candidates, 1)))
+    frame.close()
+    Path(temp_frame).unlink(missing_ok=True)
+    return paths
+
+
+def cleanup_workdir_images(base_name, include_scene_files=True):
+    """Delete preview/thumbnail JPEGs for `base_name` from the working dir.
+
+    One os.scandir pass with startswith checks against every prefix at
+    once, instead of a separate Path.glob walk per pattern.
+    """
+    prefixes = (f'{base_name}_crop_option_',)
+    if include_scene_files:
+        prefixes += (f'.{base_name}_scene_',)
+    with os.scandir('.') as entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith('.jpg') and name.startswith(prefixes):
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+
+
+_INPUT_QUEUE = None
+
+
+def _ensure_stdin_reader(state):
+    """Start (once) a daemon thread that feeds stdin lines into a queue.
+
+    Used where stdin can't be registered with a selector (e.g. Windows
+    consoles): input() blocks in its own thread and each line notifies
+    the state's condition variable, so the main thread waits on the cv
+    instead of spinning on a sleep loop that never read input at all.
+    """
+    global _INPUT_QUEUE
+    if _INPUT_QUEUE is None:
+        _INPUT_QUEUE = queue.Queue()
+
+        def _reader():
+            while True:
+                try:
+                    line = input()
+                except EOFError:
+                    return
+                _INPUT_QUEUE.put(line)
+                with state.cv:
+                    state.cv.notify_all()
+
+        threading.Thread(target=_reader, daemon=True).start()
+    return _INPUT_QUEUE
+
+
+def _wait_for_event(state, timeout):
+    """Block until stdin is readable, the web UI wakes us, or `timeout`.
+
+    One epoll/kqueue-backed selector watches both the state's wakeup pipe
+    and (when interactive) stdin, so the wait wakes exactly when something
+    happens instead of on a polling tick. Returns True when stdin has a
+    line to read; wakeup-pipe events are drained here.
+    """
+    sel = selectors.DefaultSelector()
+    try:
+        sel.register(state.wake_fd, selectors.EVENT_READ, 'wake')
+        if sys.stdin.isatty():
+            sel.register(sys.stdin, selectors.EVENT_READ, 'stdin')
+        stdin_ready = False
+        for key, _ in sel.select(timeout=timeout):
+            if key.data == 'wake':
+                state.drain_wake()
+            else:
+                stdin_ready = True
+        return stdin_ready
+    finally:
+        sel.close()
+
+
+def wait_for_selection(state, num_candidates, max_wait):
+    """Wait for a candidate choice from the terminal or the web UI."""
+    print(f'\nPick a crop (1-{num_candidates}), or choose in the web UI: ',
+          end='', flush=True)
+    deadline = time_module.monotonic() + max_wait
+    while True:
+        selected = state.get('selected_index')
+        if selected is not None:
+            print(f'\nSelected option {selected} via web UI')
+            return selected
+        remaining = deadline - time_module.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            stdin_ready = _wait_for_event(state, remaining)
+        except (OSError, ValueError):
+            # stdin isn't selectable on this platform; a reader thread
+            # feeds lines into a queue and the cv wakes us for either.
+            input_q = _ensure_stdin_reader(state)
+            with state.cv:
+                state.cv.wait_for(
+                    lambda: not input_q.empty()
+                    or state.get('selected_index') is not None,
+                    timeout=remaining)
+            if input_q.empty():
+                continue
+            line = input_q.get_nowait().strip()
+            if line.isdigit() and 1 <= int(line) <= num_candidates:
+                return int(line)
+            print(f'Enter a number 1-{num_candidates}: ', end='', flush=True)
+            continue
+        if stdin_ready:
+            line = sys.stdin.readline().strip()
+            if line.isdigit() and 1 <= int(line) <= num_candidates:
+                return int(line)
+            print(f'Enter a number 1-{num_candidates}: ', end='', flush=True)
+    print('\nNo selection made in time; defaulting to option 1')
+    return 1
+
+
+def wait_for_acceleration_choice(state, max_wait=60.0):
+    """Ask whether boring scenes should be sped up; web UI can also answer."""
+    print('Speed up boring sections? [y/N] ', end='', flush=True)
+    deadline = time_module.monotonic() + max_wait
+    while True:
+        choice = state.get('enable_acceleration')
+        if choice is not None:
+            return choice
+        remaining = deadline - time_module.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            stdin_ready = _wait_for_event(state, remaining)
+        except (OSError, ValueError):
+            input_q = _ensure_stdin_reader(state)
+            with state.cv:
+                state.cv.wait_for(
+                    lambda: not input_q.empty()
+                    or state.get('enable_acceleration') is not None,
+                    timeout=remaining)
+            if input_q.empty():
+                continue
+            return input_q.get_nowait().strip().lower().startswith('y')
+        if stdin_ready:
+            return sys.stdin.readline().strip().lower().startswith('y')
+    return False
+
+
+def wait_for_scene_selections(state, max_wait=120.0):
+    """Wait for the web UI to confirm/adjust which scenes to accelerate."""
+    with state.cv:
+        state.cv.wait_for(lambda: state.get('scene_selections') is not None,
+                          timeout=max_wait)
+    return state.get('scene_selections')
+
+
+def detect_scenes(input_file, duration, fps):
+    """Run ffmpeg scene detection, falling back to fixed-length segments."""
+    cmd = ['ffmpeg', '-i', input_file,
+           '-vf', f"select='gt(scene,{SCENE_THRESHOLD})',showinfo",
+           '-f', 'null', '-']
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True)
+    timestamps = parse_scene_timestamps(result.stderr)
+    if timestamps:
+        scenes = create_scenes_from_timestamps(timestamps, duration, fps)
+        scenes = merge_short_scenes(scenes, min_duration=MIN_SCENE_DURATION)
+    else:
+        scenes = create_time_based_segments(duration, FALLBACK_SEGMENT_DURATION, fps)
+    return filter_short_scenes(scenes, min_duration=0.2)
+
+
+def encode_video(input_file, output_file, x, y, crop_w, crop_h,
+                 accelerated_scenes, scenes, total_frames):
+    """Encode the cropped (and optionally accelerated) output video."""
+    filters = [f'crop={crop_w}:{crop_h}:{x}:{y}']
+    if accelerated_scenes:
+        # Express per-scene speedups as a piecewise setpts expression.
+        expr = 'PTS-STARTPTS'
+        for index, speedup in accelerated_scenes:
+            scene = scenes[index]
+            expr = (f"if(between(T,{scene.start_time},{scene.end_time}),"
+                    f"PTS/{speedup},{expr})")
+        filters.append(f"setpts='{expr}'")
+
+    base_cmd = ['ffmpeg', '-y', '-i', input_file,
+                '-vf', ','.join(filters),
+                '-c:v', 'libx264', '-preset', 'medium', '-crf', '20',
+                '-c:a', 'copy']
+    tracker = ProgressTracker(total_frames)
+    if os.name == 'posix':
+        process = _encode_with_pipe_progress(base_cmd, output_file, tracker)
+    else:
+        # pass_fds (and fd inheritance via pipe:N) is POSIX-only; other
+        # platforms poll a progress file instead.
+        process = _encode_with_file_progress(base_cmd, output_file, tracker)
+    print('\rEncoding: 100%')
+    if process.returncode != 0:
+        raise RuntimeError(f'ffmpeg encode failed with code {process.returncode}')
+
+
+def _encode_with_pipe_progress(base_cmd, output_file, tracker):
+    """Encode with -progress on an inherited pipe.
+
+    Events arrive as ffmpeg emits them, with no tempfile polling or
+    re-parsing of already-seen lines.
+    """
+    progress_r, progress_w = os.pipe()
+    process = subprocess.Popen(base_cmd + ['-progress', f'pipe:{progress_w}',
+                                           output_file],
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL,
+                               pass_fds=(progress_w,))
+    os.close(progress_w)
+
+    progress_cv = threading.Condition()
+    progress = {'frame': 0, 'done': False}
+
+    def _read_progress():
+        with os.fdopen(progress_r) as stream:
+            for line in stream:
+                if line.startswith('frame='):
+                    with progress_cv:
+                        progress['frame'] = int(line.split('=')[1].strip())
+                        progress_cv.notify()
+        with progress_cv:
+            progress['done'] = True
+            progress_cv.notify()
+
+    threading.Thread(target=_read_progress, daemon=True).start()
+    last_percent = -1
+    with progress_cv:
+        while not progress['done']:
+            progress_cv.wait(timeout=5.0)
+            percent = tracker.update(progress['frame'])
+            if percent != last_percent:
+                print(f'\rEncoding: {percent}%', end='', flush=True)
+                last_percent = percent
+    process.wait()
+    return process
+
+
+def _encode_with_file_progress(base_cmd, output_file, tracker):
+    """Encode with -progress into a polled tempfile (portable fallback)."""
+    progress_path = f'.{Path(output_file).stem}_encode_progress.txt'
+    process = subprocess.Popen(base_cmd + ['-progress', progress_path,
+                                           output_file],
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    last_percent = -1
+    try:
+        while process.poll() is None:
+            time_module.sleep(0.5)
+            try:
+                lines = Path(progress_path).read_text().splitlines()
+            except OSError:
+                continue
+            frames = [line for line in lines if line.startswith('frame=')]
+            if frames:
+                percent = tracker.update(int(frames[-1].split('=')[1].strip()))
+                if percent != last_percent:
+                    print(f'\rEncoding: {percent}%', end='', flush=True)
+                    last_percent = percent
+    finally:
+        Path(progress_path).unlink(missing_ok=True)
+    return process
+
+
+def main():
+    args = parse_args()
+    input_file = args.input_file
+    if not os.path.exists(input_file):
+        print(f'No such file: {input_file}', file=sys.stderr)
+        return 1
+    base_name = Path(input_file).stem
+
+    # Clear previews left over from an earlier run.
+    cleanup_workdir_images(base_name, include_scene_files=False)
+
+    analyzer = create_analyzer(input_file)
+    info = analyzer.get_video_info()
+    print(f"{input_file}: {info['width']}x{info['height']}, "
+          f"{info['duration']:.1f}s @ {info['fps']:.2f}fps")
+
+    aspect_w, aspect_h = parse_aspect_ratio(args.aspect_ratio)
+    crop = calculate_crop_dimensions(info['width'], info['height'],
+                                     aspect_w, aspect_h)
+    print(f'Crop size: {crop.width}x{crop.height} ({args.aspect_ratio})')
+
+    positions = generate_analysis_grid(info['width'], info['height'],
+                                       crop.width, crop.height,
+                                       grid_size=args.grid_size)
+
+    state = AppState()
+    state.update(state='analyzing')
+
+    def preview_path_for(index):
+        path = f'{base_name}_crop_option_{index}.jpg'
+        return path if os.path.exists(path) else None
+
+    start_web_ui(state, port=args.port, preview_path_for=preview_path_for)
+    print(f'Web UI: http://localhost:{args.port}/')
+
+    def on_progress(current, total):
+        state.update(progress=int(current / total * 100))
+        print(f'\rAnalyzing positions: {current}/{total}', end='', flush=True)
+
+    metrics = analyze_positions_parallel(
+        input_file, positions, crop.width, crop.height,
+        sample_frames=args.sample_frames,
+        max_workers=args.workers,  # Auto-detect CPU cores
+        progress_callback=on_progress)
+    print()
+
+    bounds = NormalizationBounds.from_positions(metrics)
+    candidates = generate_candidates(metrics, bounds,
+                                     info['width'], info['height'])
+
+    generate_previews(analyzer, candidates, crop.width, crop.height,
+                      info['duration'], base_name)
+    for i, candidate in enumerate(candidates, 1):
+        print(f'  {i}. ({candidate.x},{candidate.y}) '
+              f'{candidate.strategy} score={candidate.score:.1f}')
+    state.update(state='awaiting_selection',
+                 candidates=[{'x': c.x, 'y': c.y, 'score': c.score,
+                              'strategy': c.strategy} for c in candidates])
+
+    choice = wait_for_selection(state, len(candidates), args.max_wait)
+    selected = candidates[choice - 1]
+    state.update(state='scene_analysis')
+
+    scenes = detect_scenes(input_file, info['duration'], info['fps'])
+    print(f'Detected {len(scenes)} scenes')
+
+    # Quick uncropped start-of-scene previews for the web UI scene list.
+    # Each extraction is its own ffmpeg process, so they overlap cleanly.
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4)) as executor:
+        list(executor.map(
+            lambda item: analyzer.extract_frame(
+                item[1].start_time, f'.{base_name}_scene_preview_{item[0]}.jpg'),
+            enumerate(scenes, 1)))
+
+    primary_metric = determine_primary_metric(selected.strategy)
+    # Keep metric values in a parallel array as they are produced: the
+    # percentile pass below reads only this column.
+    scene_metrics = np.empty(len(scenes), dtype=np.float64)
+    for i, scene in enumerate(scenes):
+        scene.metric_value = scene_metrics[i] = analyze_scene_metrics(
+            input_file, scene, selected.x, selected.y,
+            crop.width, crop.height, metric=primary_metric)
+        print(f'\rScoring scenes: {i + 1}/{len(scenes)}', end='', flush=True)
+    print()
+
+    extract_scene_thumbnails(input_file, scenes, selected.x, selected.y,
+                             crop.width, crop.height, base_name)
+    state.update(scenes=[{'start': s.start_time, 'end': s.end_time,
+                          'metric': s.metric_value} for s in scenes])
+
+    accelerated = []
+    boring = identify_boring_sections_arr(scene_metrics)
+    if boring:
+        print(f'{len(boring)} scenes look boring')
+        if wait_for_acceleration_choice(state):
+            selections = wait_for_scene_selections(state, max_wait=30.0)
+            if selections is not None:
+                accelerated = [(i, s) for i, s in boring if i in set(selections)]
+            else:
+                accelerated = boring
+
+    output_file = f'{base_name}_cropped.mp4'
+    state.update(state='encoding')
+    encode_video(input_file, output_file, selected.x, selected.y,
+                 crop.width, crop.height, accelerated, scenes,
+                 info['frame_count'])
+    state.update(state='complete')
+    print(f'Wrote {output_file}')
+
+    # Clean up the preview/thumbnail files we scattered around.
+    cleanup_workdir_images(base_name)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
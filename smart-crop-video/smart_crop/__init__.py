@@ -0,0 +1,3 @@
+"""Smart crop: analyze a video and pick the most interesting crop window."""
+
+__version__ = "0.1.0"
@@ -0,0 +1,22 @@
+from .analyzer import PositionMetrics, VideoAnalyzer
+from .ffmpeg import FFmpegAnalyzer
+
+try:
+    from .pyav import PyAVAnalyzer
+except ImportError:
+    PyAVAnalyzer = None
+
+
+def create_analyzer(video_path: str) -> VideoAnalyzer:
+    """Return the fastest available analyzer for `video_path`.
+
+    Prefers the in-process PyAV backend (no subprocess per call) when the
+    optional `av` package is installed, falling back to the ffmpeg CLI.
+    """
+    if PyAVAnalyzer is not None:
+        return PyAVAnalyzer(video_path)
+    return FFmpegAnalyzer(video_path)
+
+
+__all__ = ["PositionMetrics", "VideoAnalyzer", "FFmpegAnalyzer",
+           "PyAVAnalyzer", "create_analyzer"]
@@ -0,0 +1,84 @@
+"""Abstract interface for video analysis backends."""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Tuple
+
+
+@dataclass
+class PositionMetrics:
+    """Metrics measured for one candidate crop position."""
+
+    x: int
+    y: int
+    motion: float
+    complexity: float
+    edges: float
+    saturation: float
+
+    def __reduce__(self):
+        # Positional-tuple pickling skips the per-instance dict payload,
+        # keeping IPC bytes minimal on the paths that still pickle
+        # results (the shared-memory path bypasses pickling entirely).
+        return (self.__class__, (self.x, self.y, self.motion,
+                                 self.complexity, self.edges,
+                                 self.saturation))
+
+
+class VideoAnalyzer(ABC):
+    """Base class for anything that can measure crop positions in a video."""
+
+    def __init__(self, video_path: str):
+        self.video_path = video_path
+
+    @abstractmethod
+    def get_dimensions(self) -> Tuple[int, int]:
+        """Return (width, height) of the video."""
+
+    @abstractmethod
+    def get_duration(self) -> float:
+        """Return the duration of the video in seconds."""
+
+    @abstractmethod
+    def get_fps(self) -> float:
+        """Return the frame rate of the video."""
+
+    def get_frame_count(self) -> int:
+        """Return the (approximate) number of frames in the video."""
+        return int(self.get_fps() * self.get_duration())
+
+    def get_video_info(self) -> dict:
+        """Gather the basic metadata used by the pipeline.
+
+        Built on the abstract getters, so every backend gets it for
+        free.
+        """
+        width, height = self.get_dimensions()
+        return {
+            'width': width,
+            'height': height,
+            'duration': self.get_duration(),
+            'fps': self.get_fps(),
+            'frame_count': self.get_frame_count(),
+        }
+
+    @abstractmethod
+    def analyze_position(self, x: int, y: int, crop_w: int, crop_h: int,
+                         sample_frames: int = 50) -> PositionMetrics:
+        """Measure motion/complexity/edges/saturation for one crop window."""
+
+    def analyze_positions(self, rects: List[Tuple[int, int, int, int]],
+                          sample_frames: int = 50) -> List[PositionMetrics]:
+        """Measure many crop windows at once.
+
+        Callers should prefer this over looping `analyze_position`:
+        backends that can share work across windows (one decode, one
+        filter graph) override it, and this default keeps the rest
+        correct with a plain loop.
+        """
+        return [self.analyze_position(x, y, w, h, sample_frames)
+                for x, y, w, h in rects]
+
+    @abstractmethod
+    def extract_frame(self, timestamp: float, output_path: str) -> None:
+        """Extract a single frame at `timestamp` to `output_path`."""
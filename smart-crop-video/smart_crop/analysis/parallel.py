@@ -0,0 +1,204 @@
+"""Parallel driver that fans position analysis out over worker processes."""
+
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from .analyzer import PositionMetrics
+
+# Row layout for transporting results through shared memory: one record
+# per position, written in place by workers instead of pickled back.
+_METRICS_DTYPE = np.dtype([('x', np.int64), ('y', np.int64),
+                           ('motion', np.float64), ('complexity', np.float64),
+                           ('edges', np.float64), ('saturation', np.float64)])
+
+# Per-worker state installed by the pool initializer: the analyzer and the
+# job invariants live here so each task only ships an (x, y) pair.
+_WORKER_STATE: dict = {}
+
+
+def _init_worker(video_path: str, crop_w: int, crop_h: int,
+                 sample_frames: int, probe: Optional[dict] = None) -> None:
+    """Pool initializer: build one analyzer per worker and stash invariants.
+
+    When the parent supplies its ffprobe result, the worker's analyzer is
+    seeded with it and never launches ffprobe itself.
+    """
+    from .ffmpeg import FFmpegAnalyzer
+    if probe is not None:
+        analyzer = FFmpegAnalyzer.__new__(FFmpegAnalyzer)
+        analyzer._apply_metadata(video_path, probe)
+    else:
+        analyzer = FFmpegAnalyzer(video_path)
+    _WORKER_STATE.update(analyzer=analyzer, crop_w=crop_w, crop_h=crop_h,
+                         sample_frames=sample_frames)
+
+
+def _attach_shm(shm_name: str) -> shared_memory.SharedMemory:
+    """Attach (cached) to the parent's result block by name."""
+    state = _WORKER_STATE
+    shm = state.get('shm')
+    if shm is None or state.get('shm_name') != shm_name:
+        if shm is not None:
+            shm.close()
+        shm = shared_memory.SharedMemory(name=shm_name)
+        state['shm'] = shm
+        state['shm_name'] = shm_name
+    return shm
+
+
+def _analyze_batch_into_shm(args) -> int:
+    """Worker entry point: analyze a batch of positions in one ffmpeg run.
+
+    The whole batch goes through the fused filter_complex graph, so one
+    subprocess launch and one decode cover every position in the batch.
+    Results are written straight into the shared result block; only the
+    batch size comes back for progress accounting.
+    """
+    indices, xys, shm_name, n = args
+    state = _WORKER_STATE
+    rects = [(x, y, state['crop_w'], state['crop_h']) for x, y in xys]
+    batch = state['analyzer']._analyze_positions_showinfo(
+        rects, state['sample_frames'])
+    view = np.ndarray((n,), dtype=_METRICS_DTYPE,
+                      buffer=_attach_shm(shm_name).buf)
+    for i, metrics in zip(indices, batch):
+        view[i] = (metrics.x, metrics.y, metrics.motion, metrics.complexity,
+                   metrics.edges, metrics.saturation)
+    return len(indices)
+
+
+# Pools are expensive to start (fork + imports + one analyzer per worker),
+# so keep them alive for the process lifetime and reuse across calls that
+# share the same shape of work.
+_POOL_CACHE: dict = {}
+_POOL_LOCK = threading.Lock()
+
+
+def _worker_context():
+    """Pick the cheapest safe start method for analysis workers.
+
+    forkserver with the analyzer module preloaded boots workers from a
+    warm template process (imports paid once) while staying safe to use
+    alongside the web UI thread; plain fork is the fallback on POSIX
+    builds without forkserver, and None keeps the platform default
+    (spawn) elsewhere.
+    """
+    try:
+        ctx = multiprocessing.get_context('forkserver')
+        ctx.set_forkserver_preload(['smart_crop.analysis.ffmpeg', 'numpy'])
+        return ctx
+    except ValueError:
+        pass
+    if hasattr(os, 'fork'):
+        return multiprocessing.get_context('fork')
+    return None
+
+
+def get_or_create_pool(max_workers: Optional[int], video_path: str,
+                       crop_w: int, crop_h: int, sample_frames: int,
+                       probe: Optional[dict] = None) -> ProcessPoolExecutor:
+    """Return a persistent executor for this video/crop, creating it lazily.
+
+    max_tasks_per_child recycles workers periodically so any memory
+    ffmpeg leaks across many analyses stays bounded.
+    """
+    key = (max_workers, video_path, crop_w, crop_h, sample_frames)
+    with _POOL_LOCK:
+        pool = _POOL_CACHE.get(key)
+        if pool is None:
+            ctx = _worker_context()
+            pool = ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_worker,
+                initargs=(video_path, crop_w, crop_h, sample_frames, probe),
+                max_tasks_per_child=64, mp_context=ctx)
+            _POOL_CACHE[key] = pool
+        return pool
+
+
+def reset_pool() -> None:
+    """Tear down all cached pools (tests, or when switching videos)."""
+    with _POOL_LOCK:
+        for pool in _POOL_CACHE.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _POOL_CACHE.clear()
+
+
+atexit.register(reset_pool)
+
+
+def analyze_positions_parallel(
+        video_path: str,
+        positions: List,
+        crop_w: int,
+        crop_h: int,
+        sample_frames: int = 50,
+        max_workers: Optional[int] = None,  # Auto-detect CPU cores
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> List[PositionMetrics]:
+    """Analyze every candidate position using a pool of worker processes."""
+    args_list = [(p.x, p.y) for p in positions]
+    # Probe the file once here; every worker reuses this metadata instead
+    # of launching its own ffprobe at startup.
+    from .ffmpeg import FFmpegAnalyzer
+    probe = FFmpegAnalyzer(video_path)._probe
+    pool = get_or_create_pool(max_workers, video_path, crop_w, crop_h,
+                              sample_frames, probe=probe)
+    n = len(args_list)
+    shm = shared_memory.SharedMemory(create=True,
+                                     size=n * _METRICS_DTYPE.itemsize)
+    try:
+        # Eight positions per ffmpeg launch amortizes fork/exec and codec
+        # init; the fused graph analyzes them all from one decode.
+        batch_size = 8
+        tasks = [(list(range(start, min(start + batch_size, n))),
+                  args_list[start:start + batch_size], shm.name, n)
+                 for start in range(0, n, batch_size)]
+        futures = [pool.submit(_analyze_batch_into_shm, task)
+                   for task in tasks]
+        # Cap callback frequency: ~100 emissions (or one per 100ms) is
+        # plenty for a progress bar and keeps callback cost off the
+        # completion hot path on fine-grained grids.
+        step = max(1, n // 100)
+        last_emit = time.monotonic()
+        completed = 0
+        for future in as_completed(futures):
+            completed += future.result()
+            now = time.monotonic()
+            if progress_callback and (completed % step == 0 or completed == n
+                                      or now - last_emit > 0.1):
+                progress_callback(completed, n)
+                last_emit = now
+        view = np.ndarray((n,), dtype=_METRICS_DTYPE, buffer=shm.buf)
+        results = [PositionMetrics(x=int(r['x']), y=int(r['y']),
+                                   motion=float(r['motion']),
+                                   complexity=float(r['complexity']),
+                                   edges=float(r['edges']),
+                                   saturation=float(r['saturation']))
+                   for r in view]
+    finally:
+        shm.close()
+        shm.unlink()
+    return results
+
+
+class ProgressTracker:
+    """Tracks percentage completion for long-running analysis steps."""
+
+    def __init__(self, total: int):
+        self.total = total
+        # Hoist the division out of update(): the callback can fire per
+        # frame, so the hot path is one multiply with no zero check.
+        self._scale = 100.0 / total if total > 0 else 0.0
+        self.percent = 0
+
+    def update(self, current: int) -> int:
+        self.percent = int(current * self._scale)
+        return self.percent
@@ -0,0 +1,398 @@
+"""Crop candidate generation: grid positions, scoring, and deduplication."""
+
+import heapq
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .strategies import (STRATEGIES, STRATEGY_BALANCED, NormalizationBounds,
+                         get_available_strategies)
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True)
+    def _region_argmax_kernel(xs, ys, scores, center_x, center_y,
+                              quarter_w, quarter_h):
+        """One fused pass finding each region's best index (-1 if empty).
+
+        Regions 0-3 are the quadrants (TL, TR, BL, BR), 4 is center.
+        """
+        best_idx = np.full(5, -1, dtype=np.int64)
+        best_score = np.full(5, -np.inf)
+        for i in range(xs.shape[0]):
+            region = (0 if xs[i] < center_x else 1) \
+                + (0 if ys[i] < center_y else 2)
+            if scores[i] > best_score[region]:
+                best_score[region] = scores[i]
+                best_idx[region] = i
+            if (abs(xs[i] - center_x) < quarter_w
+                    and abs(ys[i] - center_y) < quarter_h
+                    and scores[i] > best_score[4]):
+                best_score[4] = scores[i]
+                best_idx[4] = i
+        return best_idx
+
+# Column order of the metrics matrix; matches the strategy weight keys.
+_METRIC_FIELDS = ('motion', 'complexity', 'edges', 'saturation')
+
+
+def _valid_positions(positions: List) -> List:
+    """Drop positions on the zero edge before any scoring happens.
+
+    The grid generator never emits x or y of 0, but externally supplied
+    positions can; filtering here keeps them out of the whole pipeline
+    instead of discarding their scored candidates at dedup time.
+    """
+    return [p for p in positions if p.x > 0 and p.y > 0]
+
+
+def _metrics_matrix(positions: List) -> np.ndarray:
+    """Pack position metrics into an (N, 4) float array.
+
+    One SoA matrix shared across every strategy pass turns per-position
+    scoring calls into a handful of whole-array operations.
+    """
+    matrix = np.empty((len(positions), 4), dtype=np.float64)
+    for i, p in enumerate(positions):
+        matrix[i] = (p.motion, p.complexity, p.edges, p.saturation)
+    return matrix
+
+
+def _score_matrix(matrix: np.ndarray, bounds: NormalizationBounds,
+                  strategy: str) -> np.ndarray:
+    """Score every row of the metrics matrix under one strategy.
+
+    Vectorized equivalent of strategies.score_position: normalize each
+    column into 0-100 (flat columns pin to 50, matching the scalar
+    path), then weight and sum.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(
+            f"Unknown strategy '{strategy}'. "
+            f"Valid strategies are: {', '.join(STRATEGIES.keys())}")
+    w = np.array([STRATEGIES[strategy]['weights'][field]
+                  for field in _METRIC_FIELDS])
+    return _normalize_matrix(matrix, bounds) @ w
+
+
+def _normalize_matrix(matrix: np.ndarray,
+                      bounds: NormalizationBounds) -> np.ndarray:
+    """Normalize every metric column into 0-100 (flat columns pin to 50)."""
+    scales = np.asarray(bounds.inv_ranges)
+    normalized = (matrix - np.asarray(bounds.mins)) * scales
+    normalized[:, scales == 0] = 50.0
+    return normalized
+
+
+def _strategy_weight_matrix(strategies: List[str]) -> np.ndarray:
+    """Stack each strategy's weights into an (S, 4) matrix."""
+    return np.array([[STRATEGIES[name]['weights'][field]
+                      for field in _METRIC_FIELDS] for name in strategies])
+
+
+# Value objects: slotted to skip the per-instance dict (a 5x5 grid makes
+# 25 Positions, candidate generation ~30 ScoredCandidates) and frozen
+# since nothing mutates them after construction.
+@dataclass(slots=True, frozen=True)
+class CropDimensions:
+    width: int
+    height: int
+
+
+@dataclass(slots=True, frozen=True)
+class Position:
+    x: int
+    y: int
+
+
+@dataclass(slots=True, frozen=True)
+class ScoredCandidate:
+    x: int
+    y: int
+    score: float
+    strategy: str
+
+
+@lru_cache(maxsize=32)
+def parse_aspect_ratio(aspect_ratio: str) -> Tuple[int, int]:
+    """Parse a 'W:H' aspect ratio string into an (int, int) tuple.
+
+    Cached: the same handful of ratio strings ('9:16', '1:1', ...) come
+    through repeatedly, so repeats cost a dict lookup.
+    """
+    parts = aspect_ratio.split(':')
+    if len(parts) != 2:
+        raise ValueError(f"Invalid aspect ratio '{aspect_ratio}', expected 'W:H'")
+    try:
+        w, h = int(parts[0]), int(parts[1])
+    except ValueError:
+        raise ValueError(f"Invalid aspect ratio '{aspect_ratio}', expected integers")
+    if w <= 0 or h <= 0:
+        raise ValueError(f"Aspect ratio components must be positive: '{aspect_ratio}'")
+    return w, h
+
+
+def calculate_crop_dimensions(video_width: int, video_height: int,
+                              aspect_w: int, aspect_h: int,
+                              crop_scale: float = 1.0) -> CropDimensions:
+    """Compute the largest crop of the given aspect that fits in the video."""
+    target_ratio = aspect_w / aspect_h
+    video_ratio = video_width / video_height
+    if video_ratio > target_ratio:
+        crop_h = int(video_height * crop_scale)
+        crop_w = int(crop_h * target_ratio)
+    else:
+        crop_w = int(video_width * crop_scale)
+        crop_h = int(crop_w / target_ratio)
+    # Codecs want even dimensions; clearing the low bit is exact for
+    # these non-negative sizes and skips the div-mod.
+    crop_w &= ~1
+    crop_h &= ~1
+    return CropDimensions(width=crop_w, height=crop_h)
+
+
+def generate_analysis_grid_array(video_width: int, video_height: int,
+                                 crop_w: int, crop_h: int,
+                                 grid_size: int = 5) -> np.ndarray:
+    """Lay a grid of candidate top-left corners over the valid crop area.
+
+    Returns an (N, 2) int64 array of (x, y) rows -- the native form for
+    the vectorized scoring path. Axis values and the cross product are
+    all computed as arrays; nothing loops per cell.
+    """
+    max_x = video_width - crop_w
+    max_y = video_height - crop_h
+    if grid_size < 2:
+        return np.array([[max(1, max_x // 2), max(1, max_y // 2)]],
+                        dtype=np.int64)
+    # linspace computes each axis in one C call; rounding keeps the
+    # endpoints exact regardless of float representation.
+    xs = np.maximum(1, np.linspace(0, max(0, max_x), grid_size)
+                    .round().astype(np.int64))
+    ys = np.maximum(1, np.linspace(0, max(0, max_y), grid_size)
+                    .round().astype(np.int64))
+    gx, gy = np.meshgrid(xs, ys, indexing='xy')
+    return np.stack([gx.ravel(), gy.ravel()], axis=1)
+
+
+def generate_analysis_grid(video_width: int, video_height: int,
+                           crop_w: int, crop_h: int,
+                           grid_size: int = 5) -> List[Position]:
+    """Compatibility wrapper materializing Position objects from the grid."""
+    return [Position(int(x), int(y))
+            for x, y in generate_analysis_grid_array(
+                video_width, video_height, crop_w, crop_h, grid_size)]
+
+
+def generate_strategy_candidates(positions: List, bounds: NormalizationBounds,
+                                 strategy: str, top_n: int = 5,
+                                 matrix: Optional[np.ndarray] = None,
+                                 scores: Optional[np.ndarray] = None
+                                 ) -> List[ScoredCandidate]:
+    """Score all positions under one strategy and keep the top N.
+
+    `scores` lets a caller that already ran this strategy's pass hand the
+    result in rather than scoring again.
+    """
+    if scores is None and matrix is None:
+        positions = _valid_positions(positions)
+    return [ScoredCandidate(*t)
+            for t in _strategy_candidate_tuples(positions, bounds, strategy,
+                                                top_n, matrix, scores)]
+
+
+def _strategy_candidate_tuples(positions, bounds, strategy, top_n,
+                               matrix=None, scores=None):
+    """Top-N candidates as (x, y, score, strategy) tuples.
+
+    The tuple form flows through dedup so ScoredCandidate objects are
+    only built for the survivors.
+    """
+    if scores is None:
+        if matrix is None:
+            matrix = _metrics_matrix(positions)
+        scores = _score_matrix(matrix, bounds, strategy)
+    # Partial selection: partition pulls the top k in O(N), then only
+    # those k get ordered -- the discarded tail is never sorted.
+    k = min(top_n, len(scores))
+    part = np.argpartition(-scores, k - 1)[:k]
+    order = part[np.argsort(-scores[part])]
+    return [(positions[i].x, positions[i].y, float(scores[i]), strategy)
+            for i in order]
+
+
+def generate_spatial_candidates(positions: List, bounds: NormalizationBounds,
+                                video_width: int, video_height: int,
+                                matrix: Optional[np.ndarray] = None,
+                                balanced_scores: Optional[np.ndarray] = None
+                                ) -> List[ScoredCandidate]:
+    """Pick the best Balanced-scored position in each region of the frame.
+
+    Ensures candidates are spread across the frame rather than clustered on
+    one hotspot.
+    """
+    if balanced_scores is None and matrix is None:
+        positions = _valid_positions(positions)
+    return [ScoredCandidate(*t)
+            for t in _spatial_candidate_tuples(positions, bounds, video_width,
+                                               video_height, matrix,
+                                               balanced_scores)]
+
+
+def _spatial_candidate_tuples(positions, bounds, video_width, video_height,
+                              matrix=None, balanced_scores=None):
+    """Spatial region winners as (x, y, score, strategy) tuples."""
+    center_x = video_width // 2
+    center_y = video_height // 2
+
+    # Two vectorized coordinate comparisons yield every quadrant mask by
+    # AND-combination; center membership overlaps the quadrants, so it is
+    # its own mask.
+    xs = np.fromiter((p.x for p in positions), dtype=np.int64,
+                     count=len(positions))
+    ys = np.fromiter((p.y for p in positions), dtype=np.int64,
+                     count=len(positions))
+    left = xs < center_x
+    top = ys < center_y
+    center_mask = ((np.abs(xs - center_x) < video_width // 4)
+                   & (np.abs(ys - center_y) < video_height // 4))
+
+    regions = [
+        ('Spatial:Top-Left', left & top),
+        ('Spatial:Top-Right', ~left & top),
+        ('Spatial:Bottom-Left', left & ~top),
+        ('Spatial:Bottom-Right', ~left & ~top),
+        ('Spatial:Center', center_mask),
+    ]
+    if balanced_scores is None:
+        if matrix is None:
+            matrix = _metrics_matrix(positions)
+        balanced_scores = _score_matrix(matrix, bounds, STRATEGY_BALANCED)
+    balanced = balanced_scores
+    if njit is not None and len(positions) >= 256:
+        # Large grids: the JIT kernel fuses mask construction and argmax
+        # into a single pass over the coordinate arrays.
+        labels = [label for label, _ in regions]
+        best_idx = _region_argmax_kernel(xs, ys, np.asarray(balanced),
+                                         center_x, center_y,
+                                         video_width // 4, video_height // 4)
+        return [(positions[i].x, positions[i].y, float(balanced[i]), label)
+                for label, i in zip(labels, best_idx) if i >= 0]
+    candidates = []
+    for region_label, region_mask in regions:
+        if not region_mask.any():
+            continue
+        indices = np.nonzero(region_mask)[0]
+        best = int(indices[np.argmax(balanced[indices])])
+        candidates.append((positions[best].x, positions[best].y,
+                           float(balanced[best]), region_label))
+    return candidates
+
+
+def _deduplicate_tuples(candidates, max_candidates=10):
+    """Tuple-level dedup: best score per (x, y), then the top N overall."""
+    best: dict = {}
+    for cand in candidates:
+        x, y, score = cand[0], cand[1], cand[2]
+        kept = best.get((x, y))
+        if kept is None or score > kept[2]:
+            best[(x, y)] = cand
+    return heapq.nlargest(max_candidates, best.values(),
+                          key=itemgetter(2))
+
+
+def deduplicate_candidates(candidates: List[ScoredCandidate],
+                           max_candidates: int = 10) -> List[ScoredCandidate]:
+    """Drop duplicate (x, y) positions, keeping the highest-scored ones.
+
+    One hash pass keeps the best-scored candidate per position, then
+    nlargest orders just the survivors -- no full sort of the combined
+    candidate list.
+    """
+    tuples = [(c.x, c.y, c.score, c.strategy) for c in candidates]
+    return [ScoredCandidate(*t)
+            for t in _deduplicate_tuples(tuples, max_candidates)]
+
+
+# Memo for generate_candidates: UI/preview flows re-request candidates
+# for identical inputs, and the whole pipeline is pure. Keyed by a
+# fingerprint of positions plus every parameter; bounded like an
+# lru_cache(8) via insertion-order eviction.
+_CANDIDATE_CACHE: dict = {}
+_CANDIDATE_CACHE_MAX = 8
+# Past this many positions the fingerprint itself costs more than it
+# saves; skip caching.
+_CANDIDATE_CACHE_POSITION_LIMIT = 4096
+
+
+def generate_candidates(positions: List, bounds: NormalizationBounds,
+                        video_width: int, video_height: int,
+                        max_candidates: int = 10,
+                        top_per_strategy: int = 5) -> List[ScoredCandidate]:
+    """Produce the final deduplicated candidate list across all strategies.
+
+    Pure in its inputs, so repeat invocations with identical positions
+    and parameters return a cached result.
+    """
+    key = None
+    if len(positions) <= _CANDIDATE_CACHE_POSITION_LIMIT:
+        key = (hash(tuple((p.x, p.y, p.motion, p.complexity,
+                           p.edges, p.saturation) for p in positions)),
+               bounds.mins, bounds.inv_ranges,
+               video_width, video_height, max_candidates, top_per_strategy)
+        cached = _CANDIDATE_CACHE.get(key)
+        if cached is not None:
+            return list(cached)
+    result = _generate_candidates(positions, bounds, video_width, video_height,
+                                  max_candidates, top_per_strategy)
+    if key is not None:
+        if len(_CANDIDATE_CACHE) >= _CANDIDATE_CACHE_MAX:
+            _CANDIDATE_CACHE.pop(next(iter(_CANDIDATE_CACHE)))
+        _CANDIDATE_CACHE[key] = result
+    return list(result)
+
+
+def _generate_candidates(positions: List, bounds: NormalizationBounds,
+                         video_width: int, video_height: int,
+                         max_candidates: int,
+                         top_per_strategy: int) -> List[ScoredCandidate]:
+    # One normalization pass and one matmul produce every strategy's
+    # scores as columns of an (N, S) matrix; the per-strategy and spatial
+    # passes below just index into it.
+    positions = _valid_positions(positions)
+    matrix = _metrics_matrix(positions)
+    strategies = get_available_strategies()
+    scores_matrix = (_normalize_matrix(matrix, bounds)
+                     @ _strategy_weight_matrix(strategies).T)
+    # Candidate tuples go straight into the best-per-position dict --
+    # no intermediate combined list between the generators and dedup.
+    best: dict = {}
+
+    def _upsert(tuples):
+        for cand in tuples:
+            key = (cand[0], cand[1])
+            kept = best.get(key)
+            if kept is None or cand[2] > kept[2]:
+                best[key] = cand
+
+    balanced_scores = None
+    for j, strategy in enumerate(strategies):
+        scores = scores_matrix[:, j]
+        if strategy is STRATEGY_BALANCED:
+            # The spatial pass scores with Balanced too; reuse this column.
+            balanced_scores = scores
+        _upsert(_strategy_candidate_tuples(positions, bounds, strategy,
+                                           top_per_strategy, scores=scores))
+    _upsert(_spatial_candidate_tuples(positions, bounds, video_width,
+                                      video_height, matrix=matrix,
+                                      balanced_scores=balanced_scores))
+    return [ScoredCandidate(*t)
+            for t in heapq.nlargest(max_candidates, best.values(),
+                                    key=itemgetter(2))]
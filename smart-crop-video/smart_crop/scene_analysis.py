@@ -0,0 +1,222 @@
+"""Per-scene metric analysis and thumbnail extraction."""
+
+import os
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Set
+
+import numpy as np
+
+from .scenes import Scene
+
+# Compiled showinfo field patterns, one per metric name, built lazily so
+# repeated extraction calls skip regex construction.
+_SHOWINFO_RE: Dict[str, 're.Pattern[str]'] = {}
+
+
+def _ffmpeg_base(loglevel: str = 'error') -> List[str]:
+    """Common ffmpeg prefix: no stdin probe, no banner, tuned loglevel.
+
+    Use 'info' when showinfo output is needed on stderr and 'error' when
+    only the output frames matter -- smaller stderr means less pipe
+    traffic and smaller strings for the metric regexes to scan.
+    """
+    return ['ffmpeg', '-nostdin', '-hide_banner', '-loglevel', loglevel]
+
+
+def run_ffmpeg_stream(cmd: List[str]):
+    """Run an ffmpeg command, yielding stderr lines as they arrive.
+
+    Streaming keeps memory bounded on long scenes (showinfo emits one
+    line per frame) and lets parsers start before the process exits.
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True)
+    try:
+        for line in proc.stderr:
+            yield line.rstrip('\n')
+    finally:
+        proc.stderr.close()
+        proc.wait()
+
+
+def run_ffmpeg(cmd: List[str]) -> str:
+    """Run an ffmpeg command and return its stderr output."""
+    return '\n'.join(run_ffmpeg_stream(cmd))
+
+
+def extract_metric_from_showinfo(output: str, metric: str) -> List[float]:
+    """Pull first-plane values for `metric` out of showinfo stderr output."""
+    pat = _SHOWINFO_RE.get(metric)
+    if pat is None:
+        pat = _SHOWINFO_RE.setdefault(
+            metric, re.compile(rf'{re.escape(metric)}:\[([0-9. ]+)\]'))
+    return [float(m.split(' ', 1)[0]) for m in pat.findall(output)]
+
+
+def _split_showinfo_sections(lines) -> List[str]:
+    """Split streamed stderr lines into per-showinfo-instance chunks.
+
+    Sections come back in filter-graph order (ffmpeg numbers showinfo
+    instances as the graph string is parsed). Accepts any iterable of
+    lines, so the streaming runner feeds it without buffering stderr.
+    """
+    per_tag: Dict[int, List[str]] = {}
+    for line in lines:
+        idx = line.find('[Parsed_showinfo_')
+        if idx < 0:
+            continue
+        start = idx + 17
+        try:
+            tag = int(line[start:line.index(' ', start)].rstrip(']'))
+        except ValueError:
+            continue
+        per_tag.setdefault(tag, []).append(line)
+    return ['\n'.join(per_tag[t]) for t in sorted(per_tag)]
+
+
+def analyze_scene_metrics_multi(input_file: str, scene: Scene,
+                                x: int, y: int, crop_w: int, crop_h: int,
+                                metrics: Set[str],
+                                sample_frames: int = 10) -> Dict[str, float]:
+    """Measure several metrics for a scene in a single ffmpeg pass.
+
+    Splits the cropped stream once and taps a plain showinfo (motion,
+    complexity, saturation) and an edgedetect+showinfo branch, so one
+    decode serves every requested metric.
+    """
+    need_stats = bool(metrics & {'motion', 'complexity', 'saturation'})
+    need_edges = 'edges' in metrics
+    crop = f'crop={crop_w}:{crop_h}:{x}:{y}'
+    if need_stats and need_edges:
+        graph = (f'[0:v]{crop},split=2[a][b];[a]showinfo[s];'
+                 '[b]edgedetect=low=0.3:high=0.4,showinfo[e]')
+        maps = ['-map', '[s]', '-map', '[e]']
+    elif need_edges:
+        graph = f'[0:v]{crop},edgedetect=low=0.3:high=0.4,showinfo[e]'
+        maps = ['-map', '[e]']
+    else:
+        graph = f'[0:v]{crop},showinfo[s]'
+        maps = ['-map', '[s]']
+
+    cmd = (_ffmpeg_base('info')
+           + ['-ss', str(scene.start_time), '-i', input_file,
+              '-t', str(max(scene.duration, 0.1)), '-an', '-sn',
+              '-filter_complex', graph] + maps
+           + ['-frames:v', str(sample_frames), '-f', 'null', '-'])
+    sections = _split_showinfo_sections(run_ffmpeg_stream(cmd))
+    stats_out = sections[0] if need_stats and sections else ''
+    edges_out = (sections[-1] if need_edges and sections
+                 and (not need_stats or len(sections) > 1) else '')
+
+    results: Dict[str, float] = {}
+    if 'motion' in metrics:
+        means = extract_metric_from_showinfo(stats_out, 'mean')
+        if len(means) > 1:
+            # Vectorized diff+abs+mean; interpreter overhead dominates
+            # the Python loop even at ~100 samples.
+            results['motion'] = float(np.abs(np.diff(np.asarray(means))).mean())
+        else:
+            results['motion'] = 0.0
+    if 'complexity' in metrics:
+        stdevs = extract_metric_from_showinfo(stats_out, 'stdev')
+        results['complexity'] = float(np.mean(stdevs)) if stdevs else 0.0
+    if 'saturation' in metrics:
+        spreads = []
+        for entry in re.findall(r'stdev:\[([0-9. ]+)\]', stats_out):
+            parts = [float(p) for p in entry.split()]
+            if len(parts) >= 3:
+                spreads.append(max(parts) - min(parts))
+        results['saturation'] = (sum(spreads) / len(spreads)
+                                 if spreads else 0.0)
+    if need_edges:
+        means = extract_metric_from_showinfo(edges_out, 'mean')
+        results['edges'] = float(np.mean(means)) if means else 0.0
+    return results
+
+
+def analyze_scene_metrics(input_file: str, scene: Scene,
+                          x: int, y: int, crop_w: int, crop_h: int,
+                          metric: str = 'motion',
+                          sample_frames: int = 10) -> float:
+    """Measure one metric for a scene within the chosen crop window."""
+    return analyze_scene_metrics_multi(input_file, scene, x, y,
+                                       crop_w, crop_h, {metric},
+                                       sample_frames)[metric]
+
+
+def _run_thumb(input_file: str, timestamp: float,
+               x: int, y: int, crop_w: int, crop_h: int,
+               out_path: str) -> None:
+    """Extract one cropped frame; a worker waits mostly on ffmpeg."""
+    cmd = _ffmpeg_base() + ['-y', '-ss', str(timestamp), '-i', input_file,
+                            '-an', '-sn',
+                            '-vf', f'crop={crop_w}:{crop_h}:{x}:{y}',
+                            '-frames:v', '1', '-q:v', '4', out_path]
+    subprocess.run(cmd, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL)
+
+
+def _run_scene_thumbs(input_file: str, scene: Scene,
+                      x: int, y: int, crop_w: int, crop_h: int,
+                      first_path: str, last_path: str) -> None:
+    """Extract a scene's first and last frame in one ffmpeg pass.
+
+    One fast seek decodes the scene once; a select filter keeps only
+    frame 0 and the scene's final frame, halving process spawns versus
+    seeking twice.
+    """
+    last_n = max(scene.frame_count - 1, 1)
+    pattern = first_path + '.%d.jpg'
+    cmd = _ffmpeg_base() + [
+           '-y', '-ss', str(scene.start_time), '-i', input_file,
+           '-t', str(max(scene.duration, 0.1)), '-an', '-sn',
+           '-vf', (f'crop={crop_w}:{crop_h}:{x}:{y},'
+                   f"select='eq(n,0)+eq(n,{last_n})'"),
+           '-vsync', '0', '-frames:v', '2', '-q:v', '4',
+           '-f', 'image2', pattern]
+    subprocess.run(cmd, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL)
+    for seq, dest in ((1, first_path), (2, last_path)):
+        try:
+            os.replace(f'{first_path}.{seq}.jpg', dest)
+        except FileNotFoundError:
+            pass
+
+
+def extract_scene_thumbnails(input_file: str, scenes: List[Scene],
+                             x: int, y: int, crop_w: int, crop_h: int,
+                             base_name: str,
+                             progress_callback: Optional[Callable[[int, int], None]] = None
+                             ) -> None:
+    """Extract cropped first/last frames for each scene for the review UI.
+
+    Extractions run through a bounded thread pool: each task blocks on
+    its own ffmpeg process, so several decodes overlap instead of
+    paying 2*N sequential spawn+seek latencies.
+    """
+    total = len(scenes)
+    futures = []
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4)) as ex:
+        for i, scene in enumerate(scenes):
+            first_path = f'.{base_name}_scene_{i + 1}_first.jpg'
+            scene.first_frame_path = first_path
+
+            if scene.duration >= 0.2:
+                last_path = f'.{base_name}_scene_{i + 1}_last.jpg'
+                futures.append(ex.submit(_run_scene_thumbs, input_file,
+                                         scene, x, y, crop_w, crop_h,
+                                         first_path, last_path))
+                scene.last_frame_path = last_path
+            else:
+                # Too short for a distinct last frame: single-frame pull.
+                futures.append(ex.submit(_run_thumb, input_file,
+                                         scene.start_time, x, y,
+                                         crop_w, crop_h, first_path))
+
+        done = 0
+        for _ in as_completed(futures):
+            done += 1
+            if progress_callback:
+                progress_callback(min(done, total), total)
@@ -0,0 +1,203 @@
+"""Scene detection output parsing and scene list manipulation."""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import compress
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# showinfo's layout is fixed (frame number before pts_time on each line),
+# so one compiled pattern pulls both fields in a single pass over the
+# whole stderr buffer.
+_SCENE_RE = re.compile(rb'n:\s*(\d+).*?pts_time:([0-9.]+)')
+
+_DEFAULT_PTS_PATTERN = r'pts_time:([0-9.]+)'
+_DEFAULT_N_PATTERN = r'n:\s*(\d+)'
+
+
+@lru_cache(maxsize=8)
+def _compile(pattern: str):
+    """Compile caller-supplied patterns once per distinct string."""
+    return re.compile(pattern)
+
+
+@dataclass(slots=True)
+class Scene:
+    """One detected (or synthesized) scene in the video.
+
+    Slotted: long-form videos can hold thousands of these, and slots cut
+    the per-instance dict while speeding attribute access.
+    """
+
+    start_time: float
+    end_time: float
+    start_frame: int
+    end_frame: int
+    metric_value: float = 0.0
+    first_frame_path: Optional[str] = None
+    last_frame_path: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return self.end_time - self.start_time
+
+    @property
+    def frame_count(self) -> int:
+        return self.end_frame - self.start_frame
+
+
+def parse_scene_timestamps(ffmpeg_stderr,
+                           pts_pattern: str = _DEFAULT_PTS_PATTERN,
+                           n_pattern: str = _DEFAULT_N_PATTERN) -> List[Tuple[float, int]]:
+    """Parse (pts_time, frame_number) pairs out of ffmpeg scene-detect stderr.
+
+    The default patterns take one finditer pass over the raw bytes rather
+    than a Python-level loop with two searches per line. Custom patterns
+    fall back to the line-by-line path.
+    """
+    if (pts_pattern, n_pattern) == (_DEFAULT_PTS_PATTERN, _DEFAULT_N_PATTERN):
+        buf = (ffmpeg_stderr if isinstance(ffmpeg_stderr, bytes)
+               else ffmpeg_stderr.encode())
+        return [(float(m.group(2)), int(m.group(1)))
+                for m in _SCENE_RE.finditer(buf)]
+    if isinstance(ffmpeg_stderr, bytes):
+        ffmpeg_stderr = ffmpeg_stderr.decode(errors='replace')
+    pts_re, n_re = _compile(pts_pattern), _compile(n_pattern)
+    timestamps = []
+    for line in ffmpeg_stderr.split('\n'):
+        if 'pts_time' not in line:
+            continue
+        pts_match = pts_re.search(line)
+        n_match = n_re.search(line)
+        if pts_match and n_match:
+            timestamps.append((float(pts_match.group(1)), int(n_match.group(1))))
+    return timestamps
+
+
+def create_scenes_from_timestamps(timestamps: List[Tuple[float, int]],
+                                  video_duration: float,
+                                  fps: float) -> List[Scene]:
+    """Turn scene-change timestamps into contiguous Scene segments."""
+    all_timestamps = [(0.0, 0)]
+    all_timestamps.extend(timestamps)
+    all_timestamps.append((video_duration, int(video_duration * fps)))
+
+    # Sort-and-dedup: large boundary sets go through a structured NumPy
+    # array so both steps run in C; small ones stay in Python where the
+    # array setup would cost more than it saves.
+    if len(all_timestamps) >= 32:
+        arr = np.fromiter(all_timestamps, count=len(all_timestamps),
+                          dtype=np.dtype([('t', 'f8'), ('n', 'i8')]))
+        # Stable sort on time only: sort(order='t') would tie-break
+        # equal timestamps on the frame field, diverging from the
+        # insertion-ordered Python path below.
+        arr = arr[np.argsort(arr['t'], kind='stable')]
+        keep = np.concatenate(([True], arr[1:] != arr[:-1]))
+        unique_timestamps = [(float(t), int(n)) for t, n in arr[keep]]
+    else:
+        all_timestamps.sort(key=lambda t: t[0])
+        unique_timestamps = [all_timestamps[0]]
+        for ts in all_timestamps[1:]:
+            if ts != unique_timestamps[-1]:
+                unique_timestamps.append(ts)
+
+    scenes = []
+    for i in range(len(unique_timestamps) - 1):
+        start_time, start_frame = unique_timestamps[i]
+        end_time, end_frame = unique_timestamps[i + 1]
+        if end_time > start_time:
+            scenes.append(Scene(start_time=start_time, end_time=end_time,
+                                start_frame=start_frame, end_frame=end_frame))
+    return scenes
+
+
+def create_time_based_segments(video_duration: float,
+                               segment_duration: float,
+                               fps: float) -> List[Scene]:
+    """Fallback segmentation: slice the video into fixed-length scenes."""
+    # All boundaries at once: avoids per-iteration min() calls and the
+    # float accumulation drift of repeatedly adding segment_duration.
+    starts = np.arange(0.0, video_duration, segment_duration)
+    ends = np.minimum(starts + segment_duration, video_duration)
+    start_frames = (starts * fps).astype(np.int64)
+    end_frames = (ends * fps).astype(np.int64)
+    return [Scene(start_time=float(s), end_time=float(e),
+                  start_frame=int(sf), end_frame=int(ef))
+            for s, e, sf, ef in zip(starts, ends, start_frames, end_frames)]
+
+
+class SceneIndex:
+    """Binary-search index over scenes sorted by start time.
+
+    Build one of these when looking up many timestamps (e.g. per frame);
+    each lookup is O(log n) against a precomputed start-time array
+    instead of a linear scan of the scene list.
+    """
+
+    def __init__(self, scenes: List[Scene]):
+        self._scenes = scenes
+        self._starts = np.fromiter((s.start_time for s in scenes),
+                                   dtype=np.float64, count=len(scenes))
+
+    def lookup(self, timestamp: float) -> Optional[Scene]:
+        """Find the scene containing `timestamp`, or None."""
+        idx = int(np.searchsorted(self._starts, timestamp, side='right')) - 1
+        if idx < 0:
+            return None
+        scene = self._scenes[idx]
+        if scene.start_time <= timestamp < scene.end_time:
+            return scene
+        return None
+
+
+def get_scene_at_time(scenes: List[Scene], timestamp: float) -> Optional[Scene]:
+    """Find the scene containing `timestamp`, or None.
+
+    Convenience wrapper that builds a throwaway SceneIndex; callers doing
+    repeated lookups should hold a SceneIndex themselves.
+    """
+    return SceneIndex(scenes).lookup(timestamp)
+
+
+def merge_short_scenes(scenes: List[Scene], min_duration: float = 1.0) -> List[Scene]:
+    """Merge scenes shorter than `min_duration` into their predecessor.
+
+    The merge is index bookkeeping over the boundary values: each
+    survivor keeps its own start and takes the end of the last short
+    scene folded into it, so Scene objects are only built once for the
+    surviving rows instead of re-allocated on every merge step.
+    """
+    if not scenes:
+        return []
+    # (start index, end index) per surviving scene; a short scene extends
+    # its predecessor's end instead of starting a new pair.
+    spans = [[0, 0]]
+    for i in range(1, len(scenes)):
+        if scenes[i].duration < min_duration:
+            spans[-1][1] = i
+        else:
+            spans.append([i, i])
+    return [scenes[a] if a == b else Scene(
+        start_time=scenes[a].start_time,
+        end_time=scenes[b].end_time,
+        start_frame=scenes[a].start_frame,
+        end_frame=scenes[b].end_frame,
+        metric_value=scenes[a].metric_value,
+    ) for a, b in spans]
+
+
+def filter_short_scenes(scenes: List[Scene], min_duration: float = 0.5) -> List[Scene]:
+    """Drop scenes shorter than `min_duration` seconds.
+
+    Long scene lists pay mostly property-access overhead in the plain
+    comprehension, so durations are computed as one NumPy array and the
+    survivors picked with a boolean mask; short lists keep the
+    comprehension, where NumPy setup would cost more than it saves.
+    """
+    if len(scenes) < 64:
+        return [scene for scene in scenes if scene.duration >= min_duration]
+    durations = np.fromiter((s.end_time - s.start_time for s in scenes),
+                            dtype=np.float64, count=len(scenes))
+    return list(compress(scenes, (durations >= min_duration).tolist()))
@@ -0,0 +1,317 @@
+"""Scoring strategies: turn raw position metrics into comparable scores."""
+
+import sys
+from dataclasses import dataclass
+from types import MappingProxyType
+from functools import cached_property
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _positions_to_array(positions: List) -> np.ndarray:
+    """Pack position metrics into an (N, 4) float array, one row each."""
+    arr = np.empty((len(positions), 4), dtype=np.float64)
+    for i, p in enumerate(positions):
+        arr[i] = (p.motion, p.complexity, p.edges, p.saturation)
+    return arr
+
+# Canonical (interned) strategy names: every candidate produced in one
+# run shares these exact string objects, so equality checks short-circuit
+# on identity and no per-candidate copies exist.
+STRATEGY_BALANCED = sys.intern('Balanced')
+STRATEGY_MOTION = sys.intern('Motion Priority')
+STRATEGY_DETAIL = sys.intern('Detail Priority')
+STRATEGY_SUBJECT = sys.intern('Subject Detection')
+STRATEGY_COLOR = sys.intern('Color Interest')
+
+STRATEGIES: Dict[str, dict] = {
+    STRATEGY_BALANCED: {
+        'weights': {'motion': 0.25, 'complexity': 0.25,
+                    'edges': 0.25, 'saturation': 0.25},
+        'description': 'Equal weight to all metrics',
+        'use_case': 'General-purpose default',
+    },
+    STRATEGY_MOTION: {
+        'weights': {'motion': 0.55, 'complexity': 0.15,
+                    'edges': 0.15, 'saturation': 0.15},
+        'description': 'Favor regions where things move',
+        'use_case': 'Action footage, sports, screen recordings with activity',
+    },
+    STRATEGY_DETAIL: {
+        'weights': {'motion': 0.15, 'complexity': 0.55,
+                    'edges': 0.15, 'saturation': 0.15},
+        'description': 'Favor visually complex regions',
+        'use_case': 'Textured scenes, documents, busy UIs',
+    },
+    STRATEGY_SUBJECT: {
+        'weights': {'motion': 0.15, 'complexity': 0.15,
+                    'edges': 0.55, 'saturation': 0.15},
+        'description': 'Favor regions with strong edges (likely subjects)',
+        'use_case': 'Talking heads, product shots',
+    },
+    STRATEGY_COLOR: {
+        'weights': {'motion': 0.15, 'complexity': 0.15,
+                    'edges': 0.15, 'saturation': 0.55},
+        'description': 'Favor saturated, colorful regions',
+        'use_case': 'Nature footage, colorful content',
+    },
+}
+
+
+@dataclass
+class NormalizationBounds:
+    """Per-metric min/max over the analyzed positions, for 0-100 scaling."""
+
+    motion_min: float
+    motion_max: float
+    complexity_min: float
+    complexity_max: float
+    edges_min: float
+    edges_max: float
+    saturation_min: float
+    saturation_max: float
+
+    @classmethod
+    def from_positions(cls, positions: List) -> 'NormalizationBounds':
+        # One array pass with C-level axis reductions instead of eight
+        # generator walks over the position list.
+        arr = _positions_to_array(positions)
+        mins = arr.min(axis=0)
+        maxs = arr.max(axis=0)
+        return cls(
+            motion_min=float(mins[0]), motion_max=float(maxs[0]),
+            complexity_min=float(mins[1]), complexity_max=float(maxs[1]),
+            edges_min=float(mins[2]), edges_max=float(maxs[2]),
+            saturation_min=float(mins[3]), saturation_max=float(maxs[3]),
+        )
+
+    @cached_property
+    def mins(self) -> Tuple[float, float, float, float]:
+        """Metric minimums in (motion, complexity, edges, saturation) order."""
+        return (self.motion_min, self.complexity_min,
+                self.edges_min, self.saturation_min)
+
+    @cached_property
+    def inv_ranges(self) -> Tuple[float, float, float, float]:
+        """Per-metric 100/(max-min) scale factors, cached per instance.
+
+        Zero marks a flat range (all positions identical on that metric);
+        consumers pin those to the 50.0 midpoint. Hoists the divisions
+        out of the scoring loops -- normalization becomes one subtract
+        and one multiply per value.
+        """
+        return tuple(
+            100.0 / (hi - lo) if hi - lo > 0 else 0.0
+            for lo, hi in ((self.motion_min, self.motion_max),
+                           (self.complexity_min, self.complexity_max),
+                           (self.edges_min, self.edges_max),
+                           (self.saturation_min, self.saturation_max)))
+
+    def scale(self, metric_idx: int, value: float) -> float:
+        """Normalize one metric value by index using the cached scales.
+
+        Index order matches `mins`/`inv_ranges`: motion, complexity,
+        edges, saturation. Multiply-only path; flat ranges pin to 50.
+        """
+        inv = self.inv_ranges[metric_idx]
+        if not inv:
+            return 50.0
+        return (value - self.mins[metric_idx]) * inv
+
+    def normalize(self, value: float, min_val: float, max_val: float) -> float:
+        """Scale `value` into 0-100 within [min_val, max_val]."""
+        if max_val - min_val <= 0:
+            return 50.0
+        return (value - min_val) / (max_val - min_val) * 100.0
+
+
+# Flattened per-strategy weight tuples and the name list, built once so
+# the scalar scoring path does a single dict lookup per call instead of
+# membership test + nested weight lookups.
+_STRATEGY_WEIGHT_TUPLES: Dict[str, Tuple[float, float, float, float]] = {
+    name: (cfg['weights']['motion'], cfg['weights']['complexity'],
+           cfg['weights']['edges'], cfg['weights']['saturation'])
+    for name, cfg in STRATEGIES.items()
+}
+_STRATEGY_NAMES = tuple(STRATEGIES.keys())
+# Pre-joined name list for the invalid-strategy error paths (these sit
+# on request-validation routes, so even the failure branch stays cheap).
+_VALID_STRATEGIES_STR = ', '.join(STRATEGIES)
+
+
+def score_position(metrics, bounds: NormalizationBounds, strategy: str) -> float:
+    """Score one position's metrics under the named strategy."""
+    try:
+        wm, wc, we, ws = _STRATEGY_WEIGHT_TUPLES[strategy]
+    except KeyError:
+        raise ValueError(
+            f"Unknown strategy '{strategy}'. "
+            f"Valid strategies are: {_VALID_STRATEGIES_STR}") from None
+    m_scale, c_scale, e_scale, s_scale = bounds.inv_ranges
+    motion = ((metrics.motion - bounds.motion_min) * m_scale
+              if m_scale else 50.0)
+    complexity = ((metrics.complexity - bounds.complexity_min) * c_scale
+                  if c_scale else 50.0)
+    edges = ((metrics.edges - bounds.edges_min) * e_scale
+             if e_scale else 50.0)
+    saturation = ((metrics.saturation - bounds.saturation_min) * s_scale
+                  if s_scale else 50.0)
+    return motion * wm + complexity * wc + edges * we + saturation * ws
+
+
+# Weight vectors in (motion, complexity, edges, saturation) order, one
+# per strategy, built once at import for the batch scorer.
+_STRATEGY_WEIGHTS_NP: Dict[str, np.ndarray] = {
+    name: np.array([cfg['weights']['motion'], cfg['weights']['complexity'],
+                    cfg['weights']['edges'], cfg['weights']['saturation']])
+    for name, cfg in STRATEGIES.items()
+}
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _score_kernel(M, mins, maxs, w):
+        """Fused normalize + weighted sum over an (N, 4) metrics array."""
+        out = np.empty(M.shape[0])
+        for i in range(M.shape[0]):
+            s = 0.0
+            for j in range(4):
+                r = maxs[j] - mins[j]
+                n = 50.0 if r <= 0 else (M[i, j] - mins[j]) / r * 100.0
+                s += n * w[j]
+            out[i] = s
+        return out
+
+    # Tiny warmup so the first real batch doesn't pay JIT compilation.
+    _score_kernel(np.zeros((2, 4)), np.zeros(4), np.ones(4), np.zeros(4))
+else:
+    _score_kernel = None
+
+
+def score_positions_batch(positions: List, bounds: NormalizationBounds,
+                          strategy: str) -> np.ndarray:
+    """Score every position under one strategy in a single array pass.
+
+    Vectorized counterpart of score_position: normalization is one
+    broadcast subtract/multiply (flat metrics pin to 50, as in the
+    scalar path) and the weighted sum is one matrix-vector product.
+    """
+    weights = _STRATEGY_WEIGHTS_NP.get(strategy)
+    if weights is None:
+        raise ValueError(
+            f"Unknown strategy '{strategy}'. "
+            f"Valid strategies are: {_VALID_STRATEGIES_STR}")
+    arr = _positions_to_array(positions)
+    if _score_kernel is not None:
+        mins = np.asarray(bounds.mins)
+        maxs = np.array([bounds.motion_max, bounds.complexity_max,
+                         bounds.edges_max, bounds.saturation_max])
+        return _score_kernel(arr, mins, maxs, weights)
+    scales = np.asarray(bounds.inv_ranges)
+    norm = (arr - np.asarray(bounds.mins)) * scales
+    norm[:, scales == 0] = 50.0
+    return norm @ weights
+
+
+def get_available_strategies() -> List[str]:
+    return list(_STRATEGY_NAMES)
+
+
+def get_strategy_info(strategy: str) -> dict:
+    """Return a copy of a strategy's configuration."""
+    if strategy not in STRATEGIES:
+        raise ValueError(
+            f"Unknown strategy '{strategy}'. "
+            f"Valid strategies are: {_VALID_STRATEGIES_STR}")
+    cfg = STRATEGIES[strategy]
+    # Two-level dict copy by hand: the config is a fixed 3-key shape, so
+    # deepcopy's memo/reduce machinery is pure overhead here.
+    return {'weights': dict(cfg['weights']),
+            'description': cfg['description'],
+            'use_case': cfg['use_case']}
+
+
+_REQUIRED_WEIGHT_KEYS = ('motion', 'complexity', 'edges', 'saturation')
+
+
+def validate_strategy_weights(weights: Dict[str, float]) -> bool:
+    """Check that a weights dict has exactly the expected keys summing to ~1."""
+    if len(weights) != 4:
+        raise ValueError(
+            f"Weights must have exactly the keys: {_REQUIRED_WEIGHT_KEYS}")
+    try:
+        m, c, e, s = (weights[k] for k in _REQUIRED_WEIGHT_KEYS)
+    except KeyError:
+        raise ValueError(
+            f"Weights must have exactly the keys: "
+            f"{_REQUIRED_WEIGHT_KEYS}") from None
+    if m < 0 or c < 0 or e < 0 or s < 0:
+        raise ValueError("Weights must be non-negative")
+    total = m + c + e + s
+    if not 0.99 <= total <= 1.01:
+        raise ValueError(f"Weights must sum to 1.0 (got {total})")
+    return True
+
+
+# Read-only strategy -> scene-scoring metric table, built once so the
+# lookup below does no per-call dict construction.
+_STRATEGY_PRIMARY = MappingProxyType({
+    STRATEGY_BALANCED: 'motion',
+    STRATEGY_MOTION: 'motion',
+    STRATEGY_DETAIL: 'complexity',
+    STRATEGY_SUBJECT: 'edges',
+    STRATEGY_COLOR: 'saturation',
+})
+
+
+def determine_primary_metric(strategy: str) -> str:
+    """Map a strategy (or spatial label) to the metric used for scene scoring."""
+    if strategy.startswith('Spatial:'):
+        return 'motion'
+    return _STRATEGY_PRIMARY.get(strategy, 'motion')
+
+
+def identify_boring_sections_arr(values: np.ndarray,
+                                 percentile_threshold: float = 30.0
+                                 ) -> List[Tuple[int, float]]:
+    """Array-native variant of identify_boring_sections.
+
+    Takes the per-scene metric values as a flat array (callers that
+    already score scenes can keep one alongside the scene list and skip
+    re-materializing it here).
+    """
+    if len(values) == 0:
+        return []
+    arr = np.asarray(values, dtype=np.float64)
+    k = min(int(len(arr) * percentile_threshold / 100.0), len(arr) - 1)
+    # Only the k-th smallest value matters; quickselect finds it in
+    # expected O(N) without ordering the rest.
+    threshold = float(np.partition(arr, k)[k])
+
+    idxs = np.nonzero(arr < threshold)[0]
+    if threshold <= 0:
+        return [(int(i), 3.0) for i in idxs]
+    # One vectorized compare + blend replaces a Python branch per scene.
+    speedups = np.minimum(2.0 + 2.0 * (1.0 - arr[idxs] / threshold), 4.0)
+    return list(zip(idxs.tolist(), speedups.tolist()))
+
+
+def identify_boring_sections(scenes: List,
+                             percentile_threshold: float = 30.0
+                             ) -> List[Tuple[int, float]]:
+    """Find low-interest scenes and suggest a speedup factor for each.
+
+    Returns (scene_index, speedup) pairs for scenes whose metric falls below
+    the given percentile of all scenes.
+    """
+    if not scenes:
+        return []
+    values = np.fromiter((scene.metric_value for scene in scenes),
+                         dtype=np.float64, count=len(scenes))
+    return identify_boring_sections_arr(values, percentile_threshold)
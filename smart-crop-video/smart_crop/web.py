@@ -0,0 +1,210 @@
+"""Shared state and the selection web UI served during a run."""
+
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from flask import Flask, jsonify, request, send_file
+
+# Keys whose arrival the interactive wait loops block on.
+_WAKE_KEYS = ('selected_index', 'enable_acceleration', 'scene_selections')
+
+
+class AppState:
+    """Shared state between the pipeline thread and the web UI."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Waiters that don't need stdin can block on this instead of polling;
+        # update() notifies it on every change.
+        self.cv = threading.Condition()
+        self._data = {
+            'state': 'initializing',
+            'progress': 0,
+            'candidates': [],
+            'selected_index': None,
+            'enable_acceleration': None,
+            'scene_selections': None,
+            'scenes': [],
+            'error': None,
+        }
+        # Wakeup pipe: the wait loops select() on the read end so a web UI
+        # update interrupts them immediately instead of on the next poll tick.
+        self._wake_r, self._wake_w = os.pipe()
+
+    @property
+    def wake_fd(self) -> int:
+        """File descriptor that becomes readable when a selection arrives."""
+        return self._wake_r
+
+    def drain_wake(self) -> None:
+        """Consume any pending wakeup bytes after a select() wake."""
+        try:
+            os.set_blocking(self._wake_r, False)
+            while os.read(self._wake_r, 64):
+                pass
+        except BlockingIOError:
+            pass
+        finally:
+            os.set_blocking(self._wake_r, True)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.get(key, default)
+
+    def update(self, **kwargs) -> None:
+        with self._lock:
+            self._data.update(kwargs)
+        if any(kwargs.get(key) is not None for key in _WAKE_KEYS):
+            os.write(self._wake_w, b'1')
+        with self.cv:
+            self.cv.notify_all()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._data)
+
+    def reset(self) -> None:
+        """Return to the initial state (keeps the lock/cv/pipe objects)."""
+        with self._lock:
+            self._data = {
+                'state': 'initializing',
+                'progress': 0,
+                'candidates': [],
+                'selected_index': None,
+                'enable_acceleration': None,
+                'scene_selections': None,
+                'scenes': [],
+                'error': None,
+            }
+        with self.cv:
+            self.cv.notify_all()
+
+
+PAGE = """<!doctype html>
+<html><head><title>smart-crop-video</title></head>
+<body>
+<h1>smart-crop-video</h1>
+<p>State: <span id="state">?</span></p>
+<div id="candidates"></div>
+<script>
+async function refresh() {
+  const r = await fetch('/api/status');
+  const s = await r.json();
+  document.getElementById('state').textContent = s.state;
+  if (s.state === 'awaiting_selection') {
+    const div = document.getElementById('candidates');
+    div.innerHTML = '';
+    s.candidates.forEach((c, i) => {
+      const img = document.createElement('img');
+      img.src = '/api/preview/' + (i + 1);
+      img.style.width = '240px';
+      img.title = c.strategy + ' (' + c.score.toFixed(1) + ')';
+      img.onclick = () => fetch('/api/select', {method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({index: i + 1})});
+      div.appendChild(img);
+    });
+  }
+}
+setInterval(refresh, 1000);
+refresh();
+</script>
+</body></html>
+"""
+
+
+def create_app(state: AppState, preview_path_for: Optional[Any] = None,
+               reset_hook: Optional[Any] = None) -> Flask:
+    """Build the Flask app for the selection UI and status API.
+
+    `reset_hook`, when given, is exposed as POST /api/reset so a warm
+    server (e.g. the test container) can restart its pipeline without a
+    process re-exec.
+    """
+    app = Flask(__name__)
+
+    @app.route('/')
+    def index():
+        return PAGE
+
+    @app.route('/api/status')
+    def api_status():
+        # Optional long-poll: ?wait_for=<state>&timeout=<s> blocks until
+        # the pipeline reaches that state (or errors), so clients see
+        # transitions at notification latency instead of a poll floor.
+        target = request.args.get('wait_for')
+        if target is not None:
+            try:
+                timeout = min(float(request.args.get('timeout', 10)), 30.0)
+            except ValueError:
+                return jsonify({'error': 'invalid timeout'}), 400
+            deadline = time.monotonic() + timeout
+            with state.cv:
+                while (state.get('state') not in (target, 'error')
+                       and time.monotonic() < deadline):
+                    state.cv.wait(deadline - time.monotonic())
+        snap = state.snapshot()
+        return jsonify({
+            'state': snap['state'],
+            'progress': snap['progress'],
+            'candidates': snap['candidates'],
+            'selected_index': snap['selected_index'],
+            'error': snap['error'],
+        })
+
+    @app.route('/api/select', methods=['POST'])
+    def api_select():
+        data = request.get_json(force=True)
+        index = int(data.get('index', 0))
+        candidates = state.get('candidates')
+        if not 1 <= index <= len(candidates):
+            return jsonify({'error': f'index out of range: {index}'}), 400
+        state.update(selected_index=index)
+        return jsonify({'ok': True, 'selected_index': index})
+
+    @app.route('/api/preview/<int:index>')
+    def api_preview(index: int):
+        if preview_path_for is None:
+            return jsonify({'error': 'previews unavailable'}), 404
+        path = preview_path_for(index)
+        if path is None:
+            return jsonify({'error': f'no preview for index {index}'}), 404
+        return send_file(path, mimetype='image/jpeg')
+
+    @app.route('/api/accelerate', methods=['POST'])
+    def api_accelerate():
+        data = request.get_json(force=True)
+        state.update(enable_acceleration=bool(data.get('enable', False)))
+        return jsonify({'ok': True})
+
+    if reset_hook is not None:
+        @app.route('/api/reset', methods=['POST'])
+        def api_reset():
+            reset_hook()
+            return jsonify({'ok': True})
+
+    @app.route('/api/scenes')
+    def api_scenes():
+        return jsonify({'scenes': state.get('scenes')})
+
+    @app.route('/api/scene_select', methods=['POST'])
+    def api_scene_select():
+        data = request.get_json(force=True)
+        state.update(scene_selections=data.get('selections', []))
+        return jsonify({'ok': True})
+
+    return app
+
+
+def start_web_ui(state: AppState, port: int = 8765,
+                 preview_path_for: Optional[Any] = None) -> threading.Thread:
+    """Serve the selection UI on a daemon thread."""
+    app = create_app(state, preview_path_for=preview_path_for)
+    thread = threading.Thread(
+        target=lambda: app.run(host='0.0.0.0', port=port, debug=False,
+                               use_reloader=False),
+        daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,143 @@
+"""Fixtures for the Docker-backed integration tests."""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+import requests
+
+from helpers.api_helper import ApiClient
+from helpers.docker_manager import (CONTAINER_PORT, build_image,
+                                    get_docker_client, wait_for_healthy,
+                                    wait_for_ready)
+
+TESTS_DIR = Path(__file__).parent
+# Background container removals; joined in pytest_sessionfinish so the
+# daemon isn't mid-delete when the process exits.
+_REMOVE_THREADS = []
+REPO_ROOT = TESTS_DIR.parent
+FIXTURES_DIR = TESTS_DIR / 'fixtures'
+
+# The unit tests import smart_crop straight from the checkout; the
+# integration tests only ever talk to the container over HTTP.
+sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture(scope='session')
+def docker_client():
+    pytest.importorskip('docker')
+    try:
+        return get_docker_client()
+    except Exception:
+        pytest.skip('Docker is not available')
+
+
+@pytest.fixture(scope='session')
+def docker_image(docker_client):
+    """The test image tag, built at most once across xdist workers.
+
+    Every worker process runs its own session, so the first build is
+    serialized behind a file lock; later workers find the content-hash
+    tag already present and return immediately.
+    """
+    try:
+        from filelock import FileLock
+    except ImportError:
+        return build_image(docker_client, REPO_ROOT)
+    lock_path = REPO_ROOT / '.pytest_cache' / 'docker_image.lock'
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with FileLock(str(lock_path)):
+        return build_image(docker_client, REPO_ROOT)
+
+
+@pytest.fixture(scope='session')
+def temp_workdir():
+    """A throwaway work directory seeded with the example movie.
+
+    Session-scoped alongside the container: tests share the directory
+    and the server's /api/reset re-runs the pipeline over it.
+    """
+    fixture = FIXTURES_DIR / 'example_movie.mov'
+    if not fixture.exists():
+        pytest.skip('fixtures not generated; run tests/generate_fixtures.py')
+    # Root the workdir on tmpfs when available: the fixture copy and
+    # everything ffmpeg writes through the bind mount then stay in RAM.
+    tmp_root = '/dev/shm' if Path('/dev/shm').is_dir() else None
+    with tempfile.TemporaryDirectory(prefix='smart_crop_test_',
+                                     dir=tmp_root) as tmpdir:
+        dest = Path(tmpdir) / 'example_movie.mov'
+        try:
+            # O(1) when the fixture lives on the same filesystem.
+            os.link(fixture, dest)
+        except OSError:
+            shutil.copyfile(fixture, dest)
+        yield Path(tmpdir)
+
+
+@pytest.fixture(scope='session')
+def smart_crop_container(docker_client, docker_image, temp_workdir):
+    """One warm container for the whole session; tests reset it instead
+    of paying a fresh boot + analysis warmup each."""
+    worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+    # Let Docker pick the host port: no bind/close probe on our side and
+    # no TOCTOU window between probing and publishing under xdist.
+    container = docker_client.containers.run(
+        docker_image,
+        detach=True,
+        name=f'smart-crop-test-{worker}-{os.getpid()}',
+        ports={f'{CONTAINER_PORT}/tcp': None},
+        volumes={str(temp_workdir): {'bind': '/workdir', 'mode': 'rw'}},
+        environment={'ANALYSIS_FRAMES': '10', 'GRID_SIZE': '3',
+                     'PRESET': 'ultrafast'},
+    )
+    container.reload()
+    port = int(container.attrs['NetworkSettings']['Ports']
+               [f'{CONTAINER_PORT}/tcp'][0]['HostPort'])
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        wait_for_healthy(container)
+        wait_for_ready(base_url, max_wait=10.0)
+        yield container, base_url
+    finally:
+        # The workdir is discarded, so there is nothing to shut down
+        # gracefully: kill immediately and let the daemon-side delete
+        # run in the background instead of blocking the next fixture.
+        try:
+            container.kill()
+        except Exception:
+            pass
+
+        def _remove():
+            try:
+                container.remove(force=True, v=True)
+            except Exception:
+                pass
+
+        thread = threading.Thread(target=_remove, daemon=True)
+        thread.start()
+        _REMOVE_THREADS.append(thread)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    for thread in _REMOVE_THREADS:
+        thread.join(timeout=10)
+
+
+@pytest.fixture
+def warm_container(smart_crop_container):
+    """The session container, reset to a fresh pipeline run per test."""
+    container, base_url = smart_crop_container
+    requests.post(f'{base_url}/api/reset', timeout=5)
+    return container, base_url
+
+
+@pytest.fixture
+def api_client(warm_container):
+    _, base_url = warm_container
+    client = ApiClient(base_url)
+    yield client
+    client.close()
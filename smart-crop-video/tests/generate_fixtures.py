@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Render the MOV fixtures the integration tests mount into containers."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from helpers import video_generator as vg
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+_FIXTURES = (
+    ('motion', 'example_movie.mov', vg.create_video_with_motion),
+    ('static', 'static.mov', vg.create_static_video),
+    ('high-detail', 'high_detail.mov', vg.create_high_detail_video),
+    ('colorful', 'colorful.mov', vg.create_colorful_video),
+    ('multi-scene', 'multi_scene.mov', vg.create_multi_scene_video),
+)
+
+
+def main():
+    FIXTURES.mkdir(exist_ok=True)
+
+    # Re-encode only what is older than the generator code; unchanged
+    # fixtures cost one stat. The remaining encodes are independent
+    # ffmpeg runs, so they render in parallel.
+    newest_input = max(os.stat(p).st_mtime_ns
+                       for p in (__file__, vg.__file__))
+    stale = []
+    for label, name, generator in _FIXTURES:
+        out = FIXTURES / name
+        if not out.exists() or out.stat().st_mtime_ns < newest_input:
+            stale.append((label, out, generator))
+        else:
+            print(f'{label} fixture up to date')
+
+    if stale:
+        with ProcessPoolExecutor(
+                max_workers=min(len(stale), os.cpu_count() or 2)) as pool:
+            futures = [(label, pool.submit(generator, out))
+                       for label, out, generator in stale]
+            for label, future in futures:
+                future.result()
+                print(f'Generated {label} fixture')
+
+    print('Done.')
+
+
+if __name__ == '__main__':
+    main()
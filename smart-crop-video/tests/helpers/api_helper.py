@@ -0,0 +1,81 @@
+"""Thin client for the container's HTTP API."""
+
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ApiClient:
+    """Helpers bound to one running container's base URL.
+
+    All calls share one keep-alive Session: wait_for_status can issue
+    hundreds of polls per test, and per-call requests.get would open a
+    fresh TCP connection (and build a new pool manager) for each.
+    """
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(
+            pool_connections=1, pool_maxsize=4, max_retries=0))
+
+    def close(self) -> None:
+        self.session.close()
+
+    def get_status(self) -> dict:
+        response = self.session.get(f'{self.base_url}/api/status', timeout=5)
+        response.raise_for_status()
+        return response.json()
+
+    def select_crop(self, index: int) -> dict:
+        response = self.session.post(f'{self.base_url}/api/select',
+                                     json={'index': index}, timeout=5)
+        response.raise_for_status()
+        return response.json()
+
+    def get_preview_image(self, index: int) -> bytes:
+        response = self.session.get(f'{self.base_url}/api/preview/{index}',
+                                    timeout=10)
+        response.raise_for_status()
+        return response.content
+
+    def wait_for_status(self, target: str, timeout: float = 300.0) -> dict:
+        """Wait until the server reaches `target` state (or error/timeout).
+
+        Prefers the server's long-poll (?wait_for=...&timeout=10), which
+        returns as soon as the state flips; servers that reject the
+        parameters get the legacy 500 ms polling loop.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            response = self.session.get(
+                f'{self.base_url}/api/status',
+                params={'wait_for': target, 'timeout': 10}, timeout=15)
+            if response.status_code == 400:
+                return self._poll_for_status(
+                    target, deadline - time.monotonic())
+            response.raise_for_status()
+            status = response.json()
+            if status['state'] == target:
+                return status
+            if status['state'] == 'error':
+                raise RuntimeError(f"container errored: {status.get('error')}")
+            # Either the long-poll timed out or the server ignored the
+            # parameters; a short sleep keeps old servers from spinning.
+            time.sleep(0.05)
+        raise TimeoutError(f"state never became '{target}' within {timeout}s")
+
+    def _poll_for_status(self, target: str, timeout: float) -> dict:
+        """Legacy fixed-interval polling fallback."""
+        poll_interval = 0.5
+        elapsed = 0.0
+        while elapsed < timeout:
+            status = self.get_status()
+            if status['state'] == target:
+                return status
+            if status['state'] == 'error':
+                raise RuntimeError(f"container errored: {status.get('error')}")
+            time.sleep(poll_interval)
+            elapsed += poll_interval
+        raise TimeoutError(f"state never became '{target}' within {timeout}s")
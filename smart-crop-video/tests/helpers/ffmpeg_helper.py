@@ -0,0 +1,89 @@
+"""ffprobe helpers used to validate generated and encoded videos."""
+
+import asyncio
+import json
+import os
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+
+_PROBE_ARGS = ('-v', 'error', '-select_streams', 'v:0',
+               '-show_entries', 'stream=width,height,duration',
+               '-show_entries', 'format=duration', '-of', 'json')
+
+
+@lru_cache(maxsize=256)
+def _probe(path_str: str, mtime_ns: int, size: int) -> tuple:
+    """Run ffprobe once per (path, mtime, size); stat changes bust the key."""
+    result = subprocess.run(
+        ['ffprobe', *_PROBE_ARGS, path_str],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+    return _parse_probe(result.stdout)
+
+
+def _parse_probe(raw: bytes) -> tuple:
+    data = json.loads(raw)
+    stream = data['streams'][0]
+    duration = stream.get('duration') or data['format']['duration']
+    return (int(stream['width']), int(stream['height']), float(duration))
+
+
+def get_video_info(video_path) -> dict:
+    """Return width/height/duration for the first video stream.
+
+    Cached on the file's identity and stat signature: validators call
+    this repeatedly for the same video within a test, and each miss
+    costs an ffprobe fork.
+    """
+    st = os.stat(video_path)
+    width, height, duration = _probe(str(video_path),
+                                     st.st_mtime_ns, st.st_size)
+    return {'width': width, 'height': height, 'duration': duration}
+
+
+async def _probe_one_async(path_str: str) -> tuple:
+    proc = await asyncio.create_subprocess_exec(
+        'ffprobe', *_PROBE_ARGS, path_str,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+    out, _ = await proc.communicate()
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, 'ffprobe')
+    return _parse_probe(out)
+
+
+def get_video_info_batch(paths) -> list:
+    """Probe several videos concurrently, one ffprobe each.
+
+    Startup (execve + libav init) dominates a probe, so overlapping the
+    processes bounds wall time by the slowest probe rather than the sum.
+    Results come back in input order.
+    """
+    paths = [str(p) for p in paths]
+
+    async def _gather():
+        return await asyncio.gather(
+            *[_probe_one_async(p) for p in paths])
+
+    return [{'width': width, 'height': height, 'duration': duration}
+            for width, height, duration in asyncio.run(_gather())]
+
+
+def verify_aspect_ratio(video_path, aspect_w: int, aspect_h: int,
+                        tolerance: float = 0.02) -> bool:
+    """Check that the video's aspect ratio matches within tolerance."""
+    info = get_video_info(video_path)
+    actual = info['width'] / info['height']
+    expected = aspect_w / aspect_h
+    return abs(actual - expected) / expected <= tolerance
+
+
+def video_exists_and_valid(video_path) -> bool:
+    """True if the file exists and ffprobe can read its dimensions."""
+    path = Path(video_path)
+    if not path.exists() or path.stat().st_size == 0:
+        return False
+    try:
+        info = get_video_info(path)
+    except (subprocess.CalledProcessError, KeyError, ValueError):
+        return False
+    return info['width'] > 0 and info['height'] > 0
@@ -0,0 +1,53 @@
+"""Generate small synthetic MOV fixtures with ffmpeg's lavfi sources."""
+
+import subprocess
+
+
+def _render(filter_graph: str, output_path, duration: float, fps: int = 30):
+    subprocess.run(
+        ['ffmpeg', '-y', '-f', 'lavfi', '-i', filter_graph,
+         '-t', str(duration), '-r', str(fps),
+         '-c:v', 'libx264', '-pix_fmt', 'yuv420p', str(output_path)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+
+
+def create_video_with_motion(output_path, duration: float = 4.0,
+                             width: int = 640, height: int = 360):
+    """A bright box moving across an otherwise dark frame."""
+    _render(f'color=c=black:s={width}x{height},'
+            f"drawbox=x='mod(t*100,{width - 60})':y={height // 3}:"
+            'w=60:h=60:color=white:t=fill',
+            output_path, duration)
+
+
+def create_static_video(output_path, duration: float = 4.0,
+                        width: int = 640, height: int = 360):
+    """A completely static gray frame."""
+    _render(f'color=c=gray:s={width}x{height}', output_path, duration)
+
+
+def create_high_detail_video(output_path, duration: float = 4.0,
+                             width: int = 640, height: int = 360):
+    """High-frequency test pattern (lots of edges and texture)."""
+    _render(f'testsrc2=s={width}x{height}', output_path, duration)
+
+
+def create_colorful_video(output_path, duration: float = 4.0,
+                          width: int = 640, height: int = 360):
+    """Saturated moving color gradients."""
+    _render(f'gradients=s={width}x{height}:speed=0.5', output_path, duration)
+
+
+def create_multi_scene_video(output_path, duration: float = 6.0,
+                             width: int = 640, height: int = 360):
+    """Hard cuts between visually distinct sources, for scene detection."""
+    third = duration / 3
+    subprocess.run(
+        ['ffmpeg', '-y',
+         '-f', 'lavfi', '-i', f'color=c=red:s={width}x{height}:d={third}',
+         '-f', 'lavfi', '-i', f'testsrc2=s={width}x{height}:d={third}',
+         '-f', 'lavfi', '-i', f'color=c=blue:s={width}x{height}:d={third}',
+         '-filter_complex', '[0:v][1:v][2:v]concat=n=3:v=1:a=0',
+         '-r', '30', '-c:v', 'libx264', '-pix_fmt', 'yuv420p',
+         str(output_path)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
@@ -0,0 +1,30 @@
+"""Integration tests for the container's HTTP API."""
+
+
+def test_status_reports_pipeline_states(api_client):
+    status = api_client.get_status()
+    assert status['state'] in ('initializing', 'analyzing',
+                               'awaiting_selection', 'encoding', 'complete')
+
+
+def test_candidates_are_offered(api_client):
+    status = api_client.wait_for_status('awaiting_selection')
+    assert len(status['candidates']) >= 1
+    for candidate in status['candidates']:
+        assert candidate['x'] >= 0
+        assert candidate['y'] >= 0
+        assert 'strategy' in candidate
+
+
+def test_preview_images_served(api_client):
+    api_client.wait_for_status('awaiting_selection')
+    image = api_client.get_preview_image(1)
+    assert image[:2] == b'\xff\xd8'  # JPEG magic
+
+
+def test_select_rejects_out_of_range_index(api_client):
+    import requests
+    api_client.wait_for_status('awaiting_selection')
+    response = requests.post(f'{api_client.base_url}/api/select',
+                             json={'index': 999}, timeout=5)
+    assert response.status_code == 400
@@ -0,0 +1,13 @@
+"""End-to-end: select a crop and verify the encoded output."""
+
+from helpers.ffmpeg_helper import verify_aspect_ratio, video_exists_and_valid
+
+
+def test_full_crop_pipeline(api_client, smart_crop_container, temp_workdir):
+    api_client.wait_for_status('awaiting_selection')
+    api_client.select_crop(1)
+    api_client.wait_for_status('complete')
+
+    output = temp_workdir / 'example_movie_cropped.mp4'
+    assert video_exists_and_valid(output)
+    assert verify_aspect_ratio(output, 9, 16)
@@ -0,0 +1,159 @@
+"""Unit tests: vectorized/batch code paths match their scalar originals.
+
+No Docker or ffmpeg needed; everything here runs on synthetic inputs
+against a straightforward scalar reference written inline.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from smart_crop.analysis.analyzer import PositionMetrics
+from smart_crop.scenes import (Scene, create_scenes_from_timestamps,
+                               filter_short_scenes, merge_short_scenes)
+from smart_crop.strategies import (NormalizationBounds, _score_kernel,
+                                   get_available_strategies, score_position,
+                                   score_positions_batch)
+
+
+def _random_positions(rng, n):
+    return [PositionMetrics(x=rng.randrange(0, 500), y=rng.randrange(0, 500),
+                            motion=rng.uniform(0, 50),
+                            complexity=rng.uniform(0, 80),
+                            edges=rng.uniform(0, 30),
+                            saturation=rng.uniform(0, 60))
+            for _ in range(n)]
+
+
+class TestScoreBatch:
+    def test_matches_scalar_per_strategy(self):
+        rng = random.Random(42)
+        positions = _random_positions(rng, 40)
+        bounds = NormalizationBounds.from_positions(positions)
+        for strategy in get_available_strategies():
+            batch = score_positions_batch(positions, bounds, strategy)
+            scalar = [score_position(p, bounds, strategy) for p in positions]
+            assert np.allclose(batch, scalar)
+
+    def test_flat_metric_pins_to_midpoint(self):
+        # A metric with zero range normalizes to 50 on both paths.
+        positions = [PositionMetrics(x=i, y=0, motion=5.0, complexity=float(i),
+                                     edges=float(i * 2), saturation=float(i))
+                     for i in range(10)]
+        bounds = NormalizationBounds.from_positions(positions)
+        batch = score_positions_batch(positions, bounds, 'Motion Priority')
+        scalar = [score_position(p, bounds, 'Motion Priority')
+                  for p in positions]
+        assert np.allclose(batch, scalar)
+
+    def test_unknown_strategy_raises_on_both_paths(self):
+        positions = _random_positions(random.Random(1), 3)
+        bounds = NormalizationBounds.from_positions(positions)
+        with pytest.raises(ValueError):
+            score_position(positions[0], bounds, 'Nope')
+        with pytest.raises(ValueError):
+            score_positions_batch(positions, bounds, 'Nope')
+
+    @pytest.mark.skipif(_score_kernel is None, reason='numba not installed')
+    def test_numba_kernel_matches_numpy_fallback(self):
+        rng = random.Random(7)
+        arr = np.array([[rng.uniform(0, 100) for _ in range(4)]
+                        for _ in range(25)])
+        mins, maxs = arr.min(axis=0), arr.max(axis=0)
+        maxs[3] = mins[3]  # one flat metric exercises the pin-to-50 branch
+        w = np.array([0.25, 0.25, 0.25, 0.25])
+        ranges = maxs - mins
+        scales = np.where(ranges > 0, 100.0 / np.where(ranges > 0, ranges, 1),
+                          0.0)
+        norm = (arr - mins) * scales
+        norm[:, scales == 0] = 50.0
+        assert np.allclose(_score_kernel(arr, mins, maxs, w), norm @ w)
+
+
+class TestSceneDedup:
+    @staticmethod
+    def _reference(timestamps, duration, fps):
+        """Scalar sort/dedup/pair-up the NumPy path must reproduce."""
+        allts = [(0.0, 0)] + list(timestamps) + [(duration, int(duration * fps))]
+        allts.sort(key=lambda t: t[0])
+        uniq = [allts[0]]
+        for ts in allts[1:]:
+            if ts != uniq[-1]:
+                uniq.append(ts)
+        return [(a, b) for a, b in zip(uniq, uniq[1:]) if b[0] > a[0]]
+
+    @pytest.mark.parametrize('n', [5, 20, 40, 200])
+    def test_paths_agree_with_duplicate_times(self, n):
+        # Heavily duplicated timestamps: equal times must keep insertion
+        # order on both the small-list Python path and the NumPy path.
+        rng = random.Random(n)
+        ts = [(rng.choice([0.5, 1.0, 1.5, 2.0, round(rng.uniform(0, 9), 2)]),
+               rng.randrange(0, 300)) for _ in range(n)]
+        scenes = create_scenes_from_timestamps(ts, 10.0, 30.0)
+        got = [((s.start_time, s.start_frame), (s.end_time, s.end_frame))
+               for s in scenes]
+        assert got == self._reference(ts, 10.0, 30.0)
+
+    def test_drops_zero_length_segments(self):
+        scenes = create_scenes_from_timestamps([(5.0, 150), (5.0, 151)],
+                                               10.0, 30.0)
+        assert all(s.duration > 0 for s in scenes)
+
+
+def _make_scenes(durations, fps=30.0):
+    scenes, t = [], 0.0
+    for d in durations:
+        scenes.append(Scene(start_time=t, end_time=t + d,
+                            start_frame=int(t * fps),
+                            end_frame=int((t + d) * fps)))
+        t += d
+    return scenes
+
+
+class TestMergeShortScenes:
+    @staticmethod
+    def _reference(scenes, min_duration):
+        """Original fold-into-predecessor merge, one Scene per step."""
+        if not scenes:
+            return []
+        merged = [scenes[0]]
+        for scene in scenes[1:]:
+            if scene.duration < min_duration:
+                prev = merged[-1]
+                merged[-1] = Scene(start_time=prev.start_time,
+                                   end_time=scene.end_time,
+                                   start_frame=prev.start_frame,
+                                   end_frame=scene.end_frame,
+                                   metric_value=prev.metric_value)
+            else:
+                merged.append(scene)
+        return merged
+
+    @pytest.mark.parametrize('durations', [
+        [2.0, 0.3, 0.2, 3.0, 0.1, 1.5],
+        [0.2, 0.3, 0.1],          # everything folds into the first scene
+        [2.0, 2.0, 2.0],          # nothing to merge
+        [2.0, 0.5],
+    ])
+    def test_matches_iterative_merge(self, durations):
+        scenes = _make_scenes(durations)
+        got = merge_short_scenes(scenes, min_duration=1.0)
+        want = self._reference(scenes, 1.0)
+        assert [(s.start_time, s.end_time, s.start_frame, s.end_frame)
+                for s in got] == \
+               [(s.start_time, s.end_time, s.start_frame, s.end_frame)
+                for s in want]
+
+    def test_empty_input(self):
+        assert merge_short_scenes([]) == []
+
+
+class TestFilterShortScenes:
+    def test_mask_path_matches_comprehension(self):
+        # 100 scenes takes the NumPy mask path; the comprehension over
+        # the same list is the reference.
+        rng = random.Random(3)
+        scenes = _make_scenes([rng.uniform(0.1, 2.0) for _ in range(100)])
+        got = filter_short_scenes(scenes, min_duration=0.5)
+        assert got == [s for s in scenes if s.duration >= 0.5]